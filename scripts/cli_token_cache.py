@@ -0,0 +1,116 @@
+"""
+Persistent Azure CLI token cache shared by the helper scripts.
+
+Spawning 'az account get-access-token' costs about a second per call, so
+scripts wrap AzureCliCredential in PersistentCliCredential to reuse tokens
+across runs until they are close to expiry.
+"""
+
+import json
+import os
+import time
+from pathlib import Path
+
+from azure.core.credentials import AccessToken
+from azure.identity import AzureCliCredential
+from msrest.authentication import BasicTokenAuthentication
+
+
+# Directory holding each script's token cache file
+TOKEN_CACHE_DIR = Path.home() / ".cache" / "azure-batch-json-processor"
+TOKEN_REFRESH_MARGIN_SECONDS = 300
+
+# The Batch resource ID ends in a slash, so its default scope has a double one
+BATCH_SCOPE = "https://batch.core.windows.net//.default"
+
+
+class PersistentCliCredential:
+    """AzureCliCredential wrapper that persists access tokens between script runs."""
+
+    def __init__(self, cache_file: Path):
+        self._credential = AzureCliCredential()
+        self._cache_file = cache_file
+
+    def _read_cache(self) -> dict:
+        try:
+            cache = json.loads(self._cache_file.read_bytes())
+        except (OSError, ValueError):
+            return {}
+        if not isinstance(cache, dict):
+            return {}
+
+        # A hand-edited or foreign file is treated as a miss, never as an error
+        return {
+            key: entry for key, entry in cache.items()
+            if isinstance(entry, dict)
+            and isinstance(entry.get("token"), str)
+            and isinstance(entry.get("expires_on"), (int, float))
+        }
+
+    def _write_cache(self, cache: dict):
+        try:
+            self._cache_file.parent.mkdir(parents=True, exist_ok=True)
+            # Tokens are secrets: keep the file readable by the current user only
+            fd = os.open(self._cache_file, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+            # The mode above only applies when the file is created, so tighten an existing one too
+            if hasattr(os, "fchmod"):
+                os.fchmod(fd, 0o600)
+            with os.fdopen(fd, "w") as f:
+                json.dump(cache, f)
+        except OSError:
+            pass  # Caching is best effort
+
+    @staticmethod
+    def _cli_account() -> list:
+        """Identify the signed-in Azure CLI account from its profile, without spawning 'az'."""
+        config_dir = Path(os.environ.get("AZURE_CONFIG_DIR") or Path.home() / ".azure")
+        try:
+            # The CLI writes this file with a UTF-8 BOM
+            profile = json.loads((config_dir / "azureProfile.json").read_text(encoding="utf-8-sig"))
+        except (OSError, ValueError):
+            return []
+
+        for subscription in profile.get("subscriptions", []):
+            if subscription.get("isDefault"):
+                return [subscription.get("user", {}).get("name"), subscription.get("tenantId"), subscription.get("id")]
+        return []
+
+    def get_token(self, *scopes, **kwargs) -> AccessToken:
+        # A claims challenge (e.g. CAE) needs a fresh token, never a cached one
+        if kwargs.get("claims"):
+            return self._credential.get_token(*scopes, **kwargs)
+
+        # Key on everything that changes which token the CLI would return
+        key = json.dumps([sorted(scopes), kwargs.get("tenant_id"), self._cli_account()])
+        cache = self._read_cache()
+
+        entry = cache.get(key)
+        if entry and entry["expires_on"] - TOKEN_REFRESH_MARGIN_SECONDS > time.time():
+            return AccessToken(entry["token"], entry["expires_on"])
+
+        token = self._credential.get_token(*scopes, **kwargs)
+        cache[key] = {"token": token.token, "expires_on": token.expires_on}
+        self._write_cache(cache)
+        return token
+
+
+class BatchTokenAuthentication(BasicTokenAuthentication):
+    """
+    msrest credentials for azure-batch backed by a TokenCredential.
+
+    azure-batch is msrest-based and takes msrest credentials rather than a
+    TokenCredential. msrest signs every request through signed_session, so the
+    token is re-fetched there once it is close to expiry; a plain
+    BasicTokenAuthentication would keep sending it after it expired.
+    """
+
+    def __init__(self, credential):
+        self._credential = credential
+        self._access_token = credential.get_token(BATCH_SCOPE)
+        super().__init__({"access_token": self._access_token.token})
+
+    def signed_session(self, session=None):
+        if self._access_token.expires_on - TOKEN_REFRESH_MARGIN_SECONDS <= time.time():
+            self._access_token = self._credential.get_token(BATCH_SCOPE)
+            self.token = {"access_token": self._access_token.token}
+        return super().signed_session(session)
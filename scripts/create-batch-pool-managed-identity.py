@@ -4,16 +4,28 @@ Azure Batch Pool Creation with Managed Identity
 This script creates an Azure Batch pool with user-assigned managed identity support
 for secure storage access without using storage keys.
 
-Uses Azure CLI REST API for reliable pool creation with autoscaling.
+Uses the Azure Batch management SDK for reliable pool creation with autoscaling.
 """
 
 import os
 import sys
 import json
-import time
-import subprocess
+from functools import lru_cache
 from typing import Dict, Any
 
+from azure.core.exceptions import HttpResponseError, ResourceNotFoundError
+from azure.identity import DefaultAzureCredential
+from azure.mgmt.batch import BatchManagementClient
+
+# Upper bound on waiting for an existing pool to be deleted before re-creating it
+POOL_DELETE_TIMEOUT_SECONDS = 120
+
+@lru_cache(maxsize=8)
+def _load_config_cached(config_path: str, mtime_ns: int, size: int) -> Dict[str, Any]:
+    """Parse the config file; mtime and size only serve as the cache key."""
+    with open(config_path, 'rb') as f:
+        return json.loads(f.read())
+
 def load_config() -> Dict[str, Any]:
     """Load configuration from config.json file."""
     # Get the directory of the current script
@@ -21,8 +33,8 @@ def load_config() -> Dict[str, Any]:
     config_path = os.path.join(script_dir, "..", "config", "config.json")
     
     try:
-        with open(config_path, 'r') as f:
-            return json.load(f)
+        stat = os.stat(config_path)
+        return _load_config_cached(os.path.realpath(config_path), stat.st_mtime_ns, stat.st_size)
     except FileNotFoundError:
         print(f"❌ Configuration file not found: {config_path}")
         print("Please create config/config.json from config/config.sample.json")
@@ -60,10 +72,10 @@ def create_batch_pool_with_managed_identity():
     print(f"   Managed Identity: {managed_identity_id}")
     print()
     
-    return create_pool_with_azure_cli(config)
+    return create_pool_with_management_sdk(config)
 
-def create_pool_with_azure_cli(config: Dict[str, Any]) -> bool:
-    """Create Azure Batch pool using Azure CLI REST API calls."""
+def create_pool_with_management_sdk(config: Dict[str, Any]) -> bool:
+    """Create Azure Batch pool using the Batch management SDK."""
     
     azure_config = config['azure']
     subscription_id = azure_config['subscription_id']
@@ -76,7 +88,7 @@ def create_pool_with_azure_cli(config: Dict[str, Any]) -> bool:
     acr_config = azure_config['acr']
     container_image = f"{acr_config['login_server']}/{acr_config['image_name']}:{acr_config['image_tag']}"
     
-    print("🔧 Creating pool using Azure CLI REST API...")
+    print("🔧 Creating pool using Azure Batch management SDK...")
     
     # Define autoscale formula for optimal scaling
     autoscale_formula = (
@@ -142,39 +154,32 @@ def create_pool_with_azure_cli(config: Dict[str, Any]) -> bool:
         }
     }
     
-    # Save pool configuration to temporary file for debugging
-    pool_config_file = "pool_config_debug.json"
     try:
-        with open(pool_config_file, 'w') as f:
-            json.dump(pool_config, f, indent=2)
-        
-        print(f"📄 Pool configuration saved to {pool_config_file} for review")
-        print()
-        
+        client = BatchManagementClient(DefaultAzureCredential(), subscription_id)
+
         # Check if pool exists and delete if necessary
         print(f"🔍 Checking if pool '{pool_id}' exists...")
-        check_cmd = [
-            "az", "rest",
-            "--method", "GET",
-            "--url", f"https://management.azure.com/subscriptions/{subscription_id}/resourceGroups/{resource_group_name}/providers/Microsoft.Batch/batchAccounts/{batch_account_name}/pools/{pool_id}?api-version=2024-07-01"
-        ]
-        result = subprocess.run(check_cmd, capture_output=True, text=True, shell=True, check=False)
+        try:
+            client.pool.get(resource_group_name, batch_account_name, pool_id)
+            pool_exists = True
+        except ResourceNotFoundError:
+            pool_exists = False
         
-        if result.returncode == 0:
+        if pool_exists:
             print(f"⚠️  Pool '{pool_id}' already exists. Deleting first...")
-            delete_cmd = [
-                "az", "rest",
-                "--method", "DELETE",
-                "--url", f"https://management.azure.com/subscriptions/{subscription_id}/resourceGroups/{resource_group_name}/providers/Microsoft.Batch/batchAccounts/{batch_account_name}/pools/{pool_id}?api-version=2024-07-01"
-            ]
-            subprocess.run(delete_cmd, capture_output=True, text=True, shell=True, check=True)
+            poller = client.pool.begin_delete(resource_group_name, batch_account_name, pool_id)
             print("⏳ Waiting for pool deletion...")
-            time.sleep(30)  # Wait for deletion to complete
+            # The poller follows the service's Azure-AsyncOperation/Retry-After cadence,
+            # so it returns as soon as deletion finishes instead of after a fixed sleep
+            poller.result(timeout=POOL_DELETE_TIMEOUT_SECONDS)
+            if not poller.done():
+                print(f"❌ Pool '{pool_id}' was not deleted within {POOL_DELETE_TIMEOUT_SECONDS} seconds")
+                return False
             print(f"✅ Pool '{pool_id}' deleted successfully")
         else:
             print(f"✅ Pool '{pool_id}' does not exist, proceeding with creation")
         
-        # Create the pool using Azure REST API
+        # Create the pool via the management API
         print(f"🏗️  Creating pool '{pool_id}' with managed identity...")
         print("   VM Size: Standard_A2_v2")
         print("   Scaling: Autoscale (0-5 nodes)")
@@ -184,50 +189,38 @@ def create_pool_with_azure_cli(config: Dict[str, Any]) -> bool:
         print("   Container Support: Enabled")
         print()
         
-        create_cmd = [
-            "az", "rest",
-            "--method", "PUT",
-            "--url", f"https://management.azure.com/subscriptions/{subscription_id}/resourceGroups/{resource_group_name}/providers/Microsoft.Batch/batchAccounts/{batch_account_name}/pools/{pool_id}?api-version=2024-07-01",
-            "--body", f"@{pool_config_file}"
-        ]
-        
-        result = subprocess.run(create_cmd, capture_output=True, text=True, shell=True, check=False)
-        
-        if result.returncode == 0:
-            print("✅ Pool created successfully!")
-            print()
-            print("📊 Pool Details:")
-            print(f"   Pool ID: {pool_id}")
-            print(f"   VM Size: Standard_A2_v2")
-            print(f"   Scaling: Autoscale enabled")
-            print(f"   Max Nodes: 5")
-            print(f"   Formula: ActiveTasks with 15min sampling")
-            print("   Identity: User-assigned managed identity configured")
-            print()
-            print("🎉 Success! Pool is ready for job submission.")
-            print()
-            print("Next Steps:")
-            print(f"  1. Submit batch job: python scripts/submit-batch-job.py --pool-id {pool_id}")
-            print(f"  2. Monitor job: az batch job list --account-name {batch_account_name}")
-            print("  3. Download results: python scripts/download-results.py --output ./results/")
-            
-            return True
-        else:
+        try:
+            client.pool.create(resource_group_name, batch_account_name, pool_id, parameters=pool_config)
+        except HttpResponseError as e:
             print(f"❌ Failed to create pool:")
-            print(f"   Return code: {result.returncode}")
-            print(f"   stdout: {result.stdout}")
-            print(f"   stderr: {result.stderr}")
+            print(f"   Status code: {e.status_code}")
+            print(f"   Error: {e.message}")
             return False
+        
+        print("✅ Pool created successfully!")
+        print()
+        print("📊 Pool Details:")
+        print(f"   Pool ID: {pool_id}")
+        print(f"   VM Size: Standard_A2_v2")
+        print(f"   Scaling: Autoscale enabled")
+        print(f"   Max Nodes: 5")
+        print(f"   Formula: ActiveTasks with 15min sampling")
+        print("   Identity: User-assigned managed identity configured")
+        print()
+        print("🎉 Success! Pool is ready for job submission.")
+        print()
+        print("Next Steps:")
+        print(f"  1. Submit batch job: python scripts/submit-batch-job.py --pool-id {pool_id}")
+        print(f"  2. Monitor job: az batch job list --account-name {batch_account_name}")
+        print("  3. Download results: python scripts/download-results.py --output ./results/")
+        
+        return True
             
     except Exception as e:
         print(f"❌ Unexpected error: {e}")
         import traceback
         traceback.print_exc()
         return False
-    finally:
-        # Keep the file for debugging
-        print(f"📄 Pool configuration file kept at: {pool_config_file}")
-        pass
 
 if __name__ == "__main__":
     success = create_batch_pool_with_managed_identity()
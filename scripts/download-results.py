@@ -6,11 +6,58 @@ Downloads processed files from Azure Storage output container.
 """
 
 import argparse
+import asyncio
 import json
+import os
+import shutil
+import subprocess
 import sys
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, as_completed, wait
+from functools import lru_cache
 from pathlib import Path
+import aiohttp
+import requests
+from azure.core.credentials import AccessToken
+from azure.core.pipeline.transport import AioHttpTransport, RequestsTransport
 from azure.storage.blob import BlobServiceClient
-from azure.identity import AzureCliCredential
+from azure.storage.blob.aio import BlobServiceClient as AsyncBlobServiceClient
+
+from cli_token_cache import TOKEN_CACHE_DIR, PersistentCliCredential
+
+
+# On-disk cache of Azure CLI access tokens, so warm runs skip spawning 'az'
+TOKEN_CACHE_FILE = TOKEN_CACHE_DIR / "batch-results-dl-tokens.json"
+
+# Transfer tuning shared by the sync and async clients
+MAX_SINGLE_GET_SIZE = 64 * 1024 * 1024
+MAX_CHUNK_GET_SIZE = 16 * 1024 * 1024
+PER_BLOB_CONCURRENCY = 4
+KEEPALIVE_TIMEOUT_SECONDS = 60
+
+
+class AsyncCredentialAdapter:
+    """Expose a synchronous token credential to the asyncio SDK clients."""
+
+    def __init__(self, credential):
+        self._credential = credential
+
+    async def get_token(self, *scopes, **kwargs) -> AccessToken:
+        return await asyncio.to_thread(self._credential.get_token, *scopes, **kwargs)
+
+    async def close(self):
+        pass
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *args):
+        pass
+
+
+@lru_cache(maxsize=8)
+def _load_config_cached(path: str, mtime_ns: int, size: int) -> dict:
+    """Parse a config file; the stat fields only serve as the cache key."""
+    return json.loads(Path(path).read_bytes())
 
 
 def load_config(config_path: str = "../config/config.json") -> dict:
@@ -21,11 +68,227 @@ def load_config(config_path: str = "../config/config.json") -> dict:
         print(f"Error: Configuration file not found at {config_file}")
         sys.exit(1)
 
-    with open(config_file, 'r') as f:
-        return json.load(f)
+    stat = config_file.stat()
+    return _load_config_cached(str(config_file.resolve()), stat.st_mtime_ns, stat.st_size)
+
+
+def _preallocate(file, size: int):
+    """Reserve the full extent up front so sequential writes don't fragment."""
+    if hasattr(os, "posix_fallocate") and size:
+        try:
+            os.posix_fallocate(file.fileno(), 0, size)
+        except OSError:
+            pass
+
+
+def _drop_page_cache(file):
+    """Evict a written file from the page cache so large result sets don't crowd out other data."""
+    if hasattr(os, "posix_fadvise"):
+        file.flush()
+        os.fdatasync(file.fileno())
+        os.posix_fadvise(file.fileno(), 0, 0, os.POSIX_FADV_DONTNEED)
+
+
+def _report_download(blob, future) -> bool:
+    """Print the outcome of one download and return whether it succeeded."""
+    file_size_mb = blob.size / (1024 * 1024)
+
+    try:
+        local_file_path = future.result()
+        print(f"\nDownloaded: {blob.name} ({file_size_mb:.2f} MB)")
+        print(f"  ✓ Saved to: {local_file_path}")
+        return True
+
+    except Exception as e:
+        print(f"\nDownloading: {blob.name} ({file_size_mb:.2f} MB)")
+        print(f"  ✗ Download failed: {str(e)}")
+        return False
+
+
+def download_blobs_threaded(container_client, output_dir: Path, prefix: str = "", workers: int = 32,
+                            drop_page_cache: bool = False) -> tuple:
+    """
+    Download blobs with a thread pool, overlapping listing with downloading.
 
+    Args:
+        container_client: Container client to download from
+        output_dir: Local directory to save files
+        prefix: Blob name prefix filter
+        workers: Number of blobs to download concurrently
+        drop_page_cache: Evict each downloaded file from the OS page cache
 
-def download_results(storage_account: str, container_name: str, output_path: str, prefix: str = ""):
+    Returns:
+        Tuple of (downloaded_count, failed_count, total_count)
+    """
+    downloaded_count = 0
+    failed_count = 0
+    total_count = 0
+
+    def _download_one(blob):
+        """Download a single blob to the output directory."""
+        # Create subdirectories if blob name contains path
+        local_file_path = output_dir / blob.name
+        local_file_path.parent.mkdir(parents=True, exist_ok=True)
+
+        blob_client = container_client.get_blob_client(blob.name)
+
+        with open(local_file_path, "wb") as file:
+            _preallocate(file, blob.size)
+
+            # Stream straight to disk instead of buffering the whole blob in memory
+            download_stream = blob_client.download_blob(max_concurrency=PER_BLOB_CONCURRENCY)
+            if hasattr(download_stream, "readinto"):
+                download_stream.readinto(file)
+            else:
+                for chunk in download_stream.chunks():
+                    file.write(chunk)
+
+            if drop_page_cache:
+                _drop_page_cache(file)
+
+        return local_file_path
+
+    # In-flight work is capped to bound memory on very large containers
+    max_in_flight = workers * 4
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        pending = {}
+
+        pages = container_client.list_blobs(name_starts_with=prefix, results_per_page=5000).by_page()
+        for page in pages:
+            for blob in page:
+                total_count += 1
+                pending[executor.submit(_download_one, blob)] = blob
+
+                if len(pending) >= max_in_flight:
+                    # Results are collected on the calling thread, so no locking is needed
+                    done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        if _report_download(pending.pop(future), future):
+                            downloaded_count += 1
+                        else:
+                            failed_count += 1
+
+        for future in as_completed(pending):
+            if _report_download(pending[future], future):
+                downloaded_count += 1
+            else:
+                failed_count += 1
+
+    return downloaded_count, failed_count, total_count
+
+
+async def download_blobs_async(account_url: str, credential, container_name: str, output_dir: Path, prefix: str = "",
+                               concurrency: int = 32, drop_page_cache: bool = False) -> tuple:
+    """
+    Download blobs with the asyncio SDK on a single event loop.
+
+    Args:
+        account_url: Blob service account URL
+        credential: Synchronous token credential
+        container_name: Container name
+        output_dir: Local directory to save files
+        prefix: Blob name prefix filter
+        concurrency: Maximum number of blobs downloading at once
+        drop_page_cache: Evict each downloaded file from the OS page cache
+
+    Returns:
+        Tuple of (downloaded_count, failed_count, total_count)
+    """
+    downloaded_count = 0
+    failed_count = 0
+    total_count = 0
+
+    # aiohttp's default connector caps all connections at 100 and drops idle
+    # connections after 15s, which forces fresh TLS handshakes between bursts
+    connector = aiohttp.TCPConnector(
+        limit=max(64, concurrency * PER_BLOB_CONCURRENCY),
+        keepalive_timeout=KEEPALIVE_TIMEOUT_SECONDS
+    )
+
+    async with aiohttp.ClientSession(connector=connector) as session, AsyncBlobServiceClient(
+        account_url=account_url,
+        credential=AsyncCredentialAdapter(credential),
+        transport=AioHttpTransport(session=session, session_owner=False),
+        max_single_get_size=MAX_SINGLE_GET_SIZE,
+        max_chunk_get_size=MAX_CHUNK_GET_SIZE
+    ) as service_client:
+        container_client = service_client.get_container_client(container_name)
+
+        async def _download_one(blob):
+            """Download a single blob to the output directory."""
+            # Create subdirectories if blob name contains path
+            local_file_path = output_dir / blob.name
+            local_file_path.parent.mkdir(parents=True, exist_ok=True)
+
+            blob_client = container_client.get_blob_client(blob.name)
+            download_stream = await blob_client.download_blob(max_concurrency=PER_BLOB_CONCURRENCY)
+
+            with open(local_file_path, "wb") as file:
+                _preallocate(file, blob.size)
+                await download_stream.readinto(file)
+
+                if drop_page_cache:
+                    _drop_page_cache(file)
+
+            return local_file_path
+
+        pending = {}
+
+        def _collect(done):
+            nonlocal downloaded_count, failed_count
+            for task in done:
+                if _report_download(pending.pop(task), task):
+                    downloaded_count += 1
+                else:
+                    failed_count += 1
+
+        async for blob in container_client.list_blobs(name_starts_with=prefix, results_per_page=5000):
+            total_count += 1
+            pending[asyncio.create_task(_download_one(blob))] = blob
+
+            if len(pending) >= concurrency:
+                done, _ = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                _collect(done)
+
+        if pending:
+            done, _ = await asyncio.wait(pending)
+            _collect(done)
+
+    return downloaded_count, failed_count, total_count
+
+
+def download_with_azcopy(blob_service_client: BlobServiceClient, container_name: str, output_dir: Path, prefix: str = ""):
+    """
+    Download blobs with azcopy, signed in through the Azure CLI session.
+
+    azcopy authenticates itself (AZCOPY_AUTO_LOGIN_TYPE=AZCLI), so no SAS token ends up
+    in its command line or in error output.
+
+    Args:
+        blob_service_client: Authenticated blob service client
+        container_name: Container name
+        output_dir: Local directory to save files
+        prefix: Blob name prefix filter
+
+    Raises:
+        RuntimeError: If azcopy exits with a non-zero code
+    """
+    # A trailing wildcard copies the container contents (not the container itself) into output_dir,
+    # so files land at output_dir/<blob name> exactly as with the python engine
+    source_url = f"{blob_service_client.url.rstrip('/')}/{container_name}/*"
+    command = ["azcopy", "copy", source_url, str(output_dir), "--recursive", "--overwrite=ifSourceNewer"]
+    if prefix:
+        command.append(f"--include-path={prefix}")
+
+    env = dict(os.environ, AZCOPY_AUTO_LOGIN_TYPE="AZCLI")
+    result = subprocess.run(command, env=env)
+    if result.returncode != 0:
+        raise RuntimeError(f"azcopy exited with code {result.returncode}")
+
+
+def download_results(storage_account: str, container_name: str, output_path: str, prefix: str = "", workers: int = 32,
+                     engine: str = "auto", drop_page_cache: bool = False, sync: bool = False):
     """
     Download blobs from Azure Storage.
 
@@ -34,6 +297,10 @@ def download_results(storage_account: str, container_name: str, output_path: str
         container_name: Container name
         output_path: Local directory to save files
         prefix: Blob name prefix filter
+        workers: Number of blobs to download concurrently
+        engine: "azcopy", "python", or "auto" (azcopy when it is on PATH, falling back to python if it fails)
+        drop_page_cache: Evict each downloaded file from the OS page cache (python engine, Linux only)
+        sync: Use the thread-pool downloader instead of the asyncio one (python engine)
     """
     print("=" * 60)
     print("Azure Blob Storage Download")
@@ -48,12 +315,21 @@ def download_results(storage_account: str, container_name: str, output_path: str
     # Initialize Azure CLI credential
     print("Authenticating with Azure CLI...")
     try:
-        credential = AzureCliCredential()
+        credential = PersistentCliCredential(TOKEN_CACHE_FILE)
         account_url = f"https://{storage_account}.blob.core.windows.net"
 
+        # The default urllib3 pool keeps 10 connections per host, which would
+        # serialize concurrent downloads on connection checkout
+        session = requests.Session()
+        adapter = requests.adapters.HTTPAdapter(pool_maxsize=max(64, workers * PER_BLOB_CONCURRENCY))
+        session.mount("https://", adapter)
+
         blob_service_client = BlobServiceClient(
             account_url=account_url,
-            credential=credential
+            credential=credential,
+            transport=RequestsTransport(session=session, session_owner=False),
+            max_single_get_size=MAX_SINGLE_GET_SIZE,
+            max_chunk_get_size=MAX_CHUNK_GET_SIZE
         )
         print("✓ Authentication successful")
     except Exception as e:
@@ -73,54 +349,52 @@ def download_results(storage_account: str, container_name: str, output_path: str
         print(f"✗ Error accessing container: {str(e)}")
         sys.exit(1)
 
-    # List blobs
-    print("\nListing blobs...")
-    try:
-        blob_list = list(container_client.list_blobs(name_starts_with=prefix))
+    use_azcopy = engine == "azcopy" or (engine == "auto" and shutil.which("azcopy"))
 
-        if not blob_list:
-            print("No blobs found in container")
-            return
-
-        print(f"Found {len(blob_list)} blob(s)")
-        print("-" * 60)
+    if use_azcopy:
+        output_dir = Path(output_path)
+        output_dir.mkdir(parents=True, exist_ok=True)
 
-    except Exception as e:
-        print(f"✗ Error listing blobs: {str(e)}")
-        sys.exit(1)
+        print("\nDownloading with azcopy...")
+        try:
+            download_with_azcopy(blob_service_client, container_name, output_dir, prefix)
+        except Exception as e:
+            print(f"✗ azcopy download failed: {str(e)}")
+            if engine == "azcopy":
+                sys.exit(1)
+            # e.g. an azcopy too old for AZCLI auto-login; the python engine only needs the credential above
+            print("Falling back to the python downloader...")
+        else:
+            print("\n✓ All files downloaded successfully")
+            print(f"\nResults saved to: {output_dir.absolute()}")
+            print()
+            return
 
     # Create output directory
     output_dir = Path(output_path)
     output_dir.mkdir(parents=True, exist_ok=True)
 
-    # Download blobs
-    downloaded_count = 0
-    failed_count = 0
-
-    for blob in blob_list:
-        try:
-            blob_name = blob.name
-            file_size_mb = blob.size / (1024 * 1024)
-
-            print(f"\nDownloading: {blob_name} ({file_size_mb:.2f} MB)")
-
-            # Create subdirectories if blob name contains path
-            local_file_path = output_dir / blob_name
-            local_file_path.parent.mkdir(parents=True, exist_ok=True)
-
-            blob_client = container_client.get_blob_client(blob_name)
+    # Downloads start as soon as the first listing page arrives instead of after the
+    # whole container has been listed
+    print("\nListing and downloading blobs...")
+    print("-" * 60)
 
-            with open(local_file_path, "wb") as file:
-                download_stream = blob_client.download_blob()
-                file.write(download_stream.readall())
+    try:
+        if sync:
+            downloaded_count, failed_count, total_count = download_blobs_threaded(
+                container_client, output_dir, prefix, workers, drop_page_cache
+            )
+        else:
+            downloaded_count, failed_count, total_count = asyncio.run(download_blobs_async(
+                account_url, credential, container_name, output_dir, prefix, workers, drop_page_cache
+            ))
+    except Exception as e:
+        print(f"✗ Error listing blobs: {str(e)}")
+        sys.exit(1)
 
-            print(f"  ✓ Downloaded to: {local_file_path}")
-            downloaded_count += 1
-
-        except Exception as e:
-            print(f"  ✗ Download failed: {str(e)}")
-            failed_count += 1
-            continue
+    if total_count == 0:
+        print("No blobs found in container")
+        return
 
     # Summary
     print("\n" + "=" * 60)
@@ -128,7 +402,7 @@ def download_results(storage_account: str, container_name: str, output_path: str
     print("=" * 60)
     print(f"  Downloaded: {downloaded_count}")
     print(f"  Failed: {failed_count}")
-    print(f"  Total: {len(blob_list)}")
+    print(f"  Total: {total_count}")
     print()
 
     if failed_count > 0:
@@ -140,6 +414,14 @@ def download_results(storage_account: str, container_name: str, output_path: str
         print()
 
 
+def positive_int(value: str) -> int:
+    """argparse type for worker counts: an integer of at least 1."""
+    number = int(value)
+    if number < 1:
+        raise argparse.ArgumentTypeError(f"must be at least 1, got {value}")
+    return number
+
+
 def main():
     """Main function."""
     parser = argparse.ArgumentParser(
@@ -173,6 +455,32 @@ def main():
         help="Path to configuration file"
     )
 
+    parser.add_argument(
+        "--workers",
+        type=positive_int,
+        default=32,
+        help="Number of concurrent blob downloads (default: 32)"
+    )
+
+    parser.add_argument(
+        "--engine",
+        choices=["auto", "azcopy", "python"],
+        default="auto",
+        help="Download engine: azcopy, python (thread pool), or auto (azcopy if installed, falling back to python if it fails)"
+    )
+
+    parser.add_argument(
+        "--drop-page-cache",
+        action="store_true",
+        help="Evict downloaded files from the OS page cache after writing (Linux, python engine)"
+    )
+
+    parser.add_argument(
+        "--sync",
+        action="store_true",
+        help="Use the thread-pool downloader instead of asyncio (python engine, for debugging)"
+    )
+
     args = parser.parse_args()
 
     # Load configuration
@@ -192,7 +500,11 @@ def main():
         storage_account=storage_account,
         container_name=container_name,
         output_path=args.output,
-        prefix=args.prefix
+        prefix=args.prefix,
+        workers=args.workers,
+        engine=args.engine,
+        drop_page_cache=args.drop_page_cache,
+        sync=args.sync
     )
 
 
@@ -6,12 +6,20 @@ Generates realistic sales transaction JSON data for batch processing demonstrati
 """
 
 import json
+import os
 import random
 import argparse
 from datetime import datetime, timedelta
+from itertools import accumulate
+from multiprocessing import Pool
 from pathlib import Path
 import uuid
 
+try:
+    import orjson
+except ImportError:  # Optional: fall back to the stdlib encoder
+    orjson = None
+
 
 class SyntheticDataGenerator:
     """Generates synthetic e-commerce sales transaction data."""
@@ -27,28 +35,31 @@ class SyntheticDataGenerator:
         "Davis", "Rodriguez", "Martinez", "Hernandez", "Lopez", "Gonzalez"
     ]
 
+    # Prices are held in integer cents so generation never accumulates float error
     PRODUCTS = [
-        {"name": "Wireless Headphones", "category": "Electronics", "base_price": 79.99},
-        {"name": "USB-C Cable", "category": "Electronics", "base_price": 12.99},
-        {"name": "Laptop Stand", "category": "Office", "base_price": 45.00},
-        {"name": "Mechanical Keyboard", "category": "Electronics", "base_price": 129.99},
-        {"name": "Ergonomic Mouse", "category": "Electronics", "base_price": 59.99},
-        {"name": "Notebook Set", "category": "Stationery", "base_price": 15.99},
-        {"name": "Water Bottle", "category": "Home", "base_price": 24.99},
-        {"name": "Desk Lamp", "category": "Office", "base_price": 39.99},
-        {"name": "Phone Case", "category": "Accessories", "base_price": 19.99},
-        {"name": "Backpack", "category": "Bags", "base_price": 69.99},
-        {"name": "Portable Charger", "category": "Electronics", "base_price": 34.99},
-        {"name": "Screen Protector", "category": "Accessories", "base_price": 9.99},
-        {"name": "Coffee Mug", "category": "Home", "base_price": 12.99},
-        {"name": "Desk Organizer", "category": "Office", "base_price": 27.99},
-        {"name": "Fitness Tracker", "category": "Wearables", "base_price": 99.99},
+        {"name": "Wireless Headphones", "category": "Electronics", "base_price_cents": 7999},
+        {"name": "USB-C Cable", "category": "Electronics", "base_price_cents": 1299},
+        {"name": "Laptop Stand", "category": "Office", "base_price_cents": 4500},
+        {"name": "Mechanical Keyboard", "category": "Electronics", "base_price_cents": 12999},
+        {"name": "Ergonomic Mouse", "category": "Electronics", "base_price_cents": 5999},
+        {"name": "Notebook Set", "category": "Stationery", "base_price_cents": 1599},
+        {"name": "Water Bottle", "category": "Home", "base_price_cents": 2499},
+        {"name": "Desk Lamp", "category": "Office", "base_price_cents": 3999},
+        {"name": "Phone Case", "category": "Accessories", "base_price_cents": 1999},
+        {"name": "Backpack", "category": "Bags", "base_price_cents": 6999},
+        {"name": "Portable Charger", "category": "Electronics", "base_price_cents": 3499},
+        {"name": "Screen Protector", "category": "Accessories", "base_price_cents": 999},
+        {"name": "Coffee Mug", "category": "Home", "base_price_cents": 1299},
+        {"name": "Desk Organizer", "category": "Office", "base_price_cents": 2799},
+        {"name": "Fitness Tracker", "category": "Wearables", "base_price_cents": 9999},
     ]
 
     COUNTRIES = ["USA", "Canada", "UK", "Germany", "France", "Australia", "Japan"]
     STATES = ["CA", "NY", "TX", "FL", "WA", "IL", "PA", "OH", "GA", "NC"]
     PAYMENT_METHODS = ["Credit Card", "Debit Card", "PayPal", "Apple Pay", "Google Pay"]
     SHIPPING_METHODS = ["Standard", "Express", "Next Day", "International"]
+    SHIPPING_COSTS_CENTS = (599, 1299, 2499, 3599)  # Aligned with SHIPPING_METHODS
+    STATUSES = ("completed", "completed", "completed", "pending", "cancelled")  # Weighted towards completed
 
     def __init__(self, seed=None):
         """Initialize generator with optional seed for reproducibility."""
@@ -57,131 +68,339 @@ class SyntheticDataGenerator:
 
     def generate_customer(self):
         """Generate a random customer profile."""
-        first_name = random.choice(self.FIRST_NAMES)
-        last_name = random.choice(self.LAST_NAMES)
+        choice = random.choice
+        countries = self.COUNTRIES
+
+        first_name = choice(self.FIRST_NAMES)
+        last_name = choice(self.LAST_NAMES)
 
         return {
             "customer_id": f"CUST-{random.randint(10000, 99999)}",
             "name": f"{first_name} {last_name}",
             "email": f"{first_name.lower()}.{last_name.lower()}@example.com",
-            "country": random.choice(self.COUNTRIES),
-            "state": random.choice(self.STATES) if random.choice(self.COUNTRIES) == "USA" else None
+            "country": choice(countries),
+            "state": choice(self.STATES) if choice(countries) == "USA" else None
         }
 
     def generate_line_item(self):
         """Generate a single line item (product) in a transaction."""
-        product = random.choice(self.PRODUCTS)
-        quantity = random.randint(1, 5)
-
-        # Add some price variation (±20%)
-        price_variation = random.uniform(0.8, 1.2)
-        unit_price = round(product["base_price"] * price_variation, 2)
+        return self.generate_line_items(1)[0]
 
-        # Occasional discounts
-        discount = 0.0
-        if random.random() < 0.15:  # 15% chance of discount
-            discount = round(random.uniform(0.05, 0.30) * unit_price * quantity, 2)
+    def generate_line_items(self, count):
+        """Generate ``count`` line items, drawing all random inputs in bulk."""
+        # Bind hot callables once instead of resolving them per item
+        choices = random.choices
+        uniform = random.uniform
+        rand = random.random
 
-        subtotal = round(unit_price * quantity - discount, 2)
+        products = choices(self.PRODUCTS, k=count)
+        quantities = choices(range(1, 6), k=count)
+        product_ids = choices(range(1000, 10000), k=count)
 
-        return {
-            "product_id": f"PROD-{random.randint(1000, 9999)}",
-            "product_name": product["name"],
-            "category": product["category"],
-            "quantity": quantity,
-            "unit_price": unit_price,
-            "discount": discount,
-            "subtotal": subtotal
-        }
-
-    def generate_transaction(self, transaction_date=None):
-        """Generate a complete transaction."""
-        if transaction_date is None:
-            # Random date within last 30 days
-            days_ago = random.randint(0, 30)
-            transaction_date = datetime.now() - timedelta(days=days_ago)
+        # Add some price variation (±20%)
+        price_variations = [uniform(0.8, 1.2) for _ in range(count)]
+
+        # Occasional discounts (15% chance)
+        discount_rolls = [rand() for _ in range(count)]
+        discount_rates = [uniform(0.05, 0.30) for _ in range(count)]
+
+        line_items = []
+        append = line_items.append
+        for product, quantity, product_id, price_variation, discount_roll, discount_rate in zip(
+            products, quantities, product_ids, price_variations, discount_rolls, discount_rates
+        ):
+            # Work in integer cents (rounding half up) and convert once for output
+            unit_cents = int(product["base_price_cents"] * price_variation + 0.5)
+
+            discount_cents = 0
+            if discount_roll < 0.15:
+                discount_cents = int(discount_rate * unit_cents * quantity + 0.5)
+
+            subtotal_cents = unit_cents * quantity - discount_cents
+
+            append({
+                "product_id": f"PROD-{product_id}",
+                "product_name": product["name"],
+                "category": product["category"],
+                "quantity": quantity,
+                "unit_price": unit_cents / 100,
+                "discount": discount_cents / 100,
+                "subtotal": subtotal_cents / 100
+            })
+
+        return line_items
+
+    @staticmethod
+    def generate_transaction_ids(count):
+        """Generate ``count`` random (version 4) UUID strings from one urandom draw."""
+        raw = bytearray(os.urandom(16 * count))
+
+        # Set the RFC 4122 version (4) and variant bits
+        raw[6::16] = bytes((b & 0x0F) | 0x40 for b in raw[6::16])
+        raw[8::16] = bytes((b & 0x3F) | 0x80 for b in raw[8::16])
+
+        hex_ids = raw.hex()
+        return [
+            f"{h[:8]}-{h[8:12]}-{h[12:16]}-{h[16:20]}-{h[20:]}"
+            for h in (hex_ids[i:i + 32] for i in range(0, len(hex_ids), 32))
+        ]
 
-        # Add random time
-        transaction_date = transaction_date.replace(
-            hour=random.randint(0, 23),
-            minute=random.randint(0, 59),
-            second=random.randint(0, 59)
-        )
+    @staticmethod
+    def generate_timestamps(transaction_date, count):
+        """
+        Generate ``count`` ISO-8601 timestamps at random times on ``transaction_date``.
+
+        Produces the same strings as ``transaction_date.replace(hour=..., minute=...,
+        second=...).isoformat() + "Z"`` without creating a datetime per timestamp.
+        """
+        prefix = transaction_date.strftime('%Y-%m-%dT')
+        suffix = f".{transaction_date.microsecond:06d}Z" if transaction_date.microsecond else "Z"
+
+        timestamps = []
+        append = timestamps.append
+        for seconds in random.choices(range(86400), k=count):
+            hours, seconds = divmod(seconds, 3600)
+            minutes, seconds = divmod(seconds, 60)
+            append(f"{prefix}{hours:02d}:{minutes:02d}:{seconds:02d}{suffix}")
+
+        return timestamps
+
+    def generate_transaction(self, transaction_date=None, line_items=None, transaction_id=None, customer_pool=None,
+                             timestamp=None):
+        """Generate a complete transaction, optionally from pre-generated fields and customers."""
+        randint = random.randint
+        rand = random.random
+
+        if timestamp is None:
+            if transaction_date is None:
+                # Random date within last 30 days
+                days_ago = randint(0, 30)
+                transaction_date = datetime.now() - timedelta(days=days_ago)
+
+            # Add random time
+            timestamp = transaction_date.replace(
+                hour=randint(0, 23),
+                minute=randint(0, 59),
+                second=randint(0, 59)
+            ).isoformat() + "Z"
 
         # Generate line items (1-5 items per transaction)
-        num_items = random.randint(1, 5)
-        line_items = [self.generate_line_item() for _ in range(num_items)]
+        if line_items is None:
+            line_items = self.generate_line_items(randint(1, 5))
 
-        # Calculate totals
-        subtotal = sum(item["subtotal"] for item in line_items)
-        tax_rate = 0.08  # 8% tax
-        tax = round(subtotal * tax_rate, 2)
+        # Calculate totals (in integer cents)
+        subtotal_cents = sum(int(item["subtotal"] * 100 + 0.5) for item in line_items)
+        tax_cents = (subtotal_cents * 8 + 50) // 100  # 8% tax, rounded half up
 
         # Shipping cost based on method
-        shipping_method = random.choice(self.SHIPPING_METHODS)
-        shipping_cost = {
-            "Standard": 5.99,
-            "Express": 12.99,
-            "Next Day": 24.99,
-            "International": 35.99
-        }[shipping_method]
+        shipping_index = random.randrange(len(self.SHIPPING_METHODS))
+        shipping_method = self.SHIPPING_METHODS[shipping_index]
+        shipping_cents = self.SHIPPING_COSTS_CENTS[shipping_index]
 
-        total = round(subtotal + tax + shipping_cost, 2)
+        total_cents = subtotal_cents + tax_cents + shipping_cents
 
         # Generate anomaly: very high value transaction (for anomaly detection demo)
         is_anomaly = False
-        if random.random() < 0.01:  # 1% chance
-            total = round(total * random.uniform(10, 50), 2)
+        if rand() < 0.01:  # 1% chance
+            total_cents = int(total_cents * random.uniform(10, 50) + 0.5)
             is_anomaly = True
 
+        if transaction_id is None:
+            transaction_id = str(uuid.uuid4())
+
+        # Customers from a shared pool are reused as-is; they are never mutated
+        customer = random.choice(customer_pool) if customer_pool else self.generate_customer()
+
         return {
-            "transaction_id": str(uuid.uuid4()),
-            "timestamp": transaction_date.isoformat() + "Z",
-            "customer": self.generate_customer(),
+            "transaction_id": transaction_id,
+            "timestamp": timestamp,
+            "customer": customer,
             "line_items": line_items,
-            "subtotal": subtotal,
-            "tax": tax,
-            "shipping_cost": shipping_cost,
-            "total": total,
+            "subtotal": subtotal_cents / 100,
+            "tax": tax_cents / 100,
+            "shipping_cost": shipping_cents / 100,
+            "total": total_cents / 100,
             "payment_method": random.choice(self.PAYMENT_METHODS),
             "shipping_method": shipping_method,
-            "status": random.choice(["completed", "completed", "completed", "pending", "cancelled"]),
+            "status": random.choice(self.STATUSES),
             "_is_synthetic_anomaly": is_anomaly  # Hidden flag for testing
         }
 
-    def generate_batch(self, count=1000, batch_date=None):
-        """Generate a batch of transactions."""
+    def iter_transactions(self, count=1000, batch_date=None, chunk_size=10000):
+        """
+        Yield ``count`` transactions, drawing random inputs ``chunk_size`` at a time.
+
+        Memory use is bounded by the chunk size rather than the batch size.
+        """
         if batch_date is None:
             batch_date = datetime.now()
 
-        batch_id = f"batch_{batch_date.strftime('%Y%m%d_%H%M%S')}"
-
-        transactions = [
-            self.generate_transaction(batch_date)
-            for _ in range(count)
-        ]
+        # Realistic batches have repeat customers: draw from a pool ~1/3 the batch size.
+        # That averages 3 orders per customer, so few cross the processor's >10-order
+        # frequent-customer anomaly threshold by chance
+        customer_pool = [self.generate_customer() for _ in range(max(1, count // 3))]
+
+        for chunk_start in range(0, count, chunk_size):
+            chunk_count = min(chunk_size, count - chunk_start)
+
+            # Draw every line item for the chunk in one go, then slice per transaction
+            item_counts = random.choices(range(1, 6), k=chunk_count)
+            line_items = self.generate_line_items(sum(item_counts))
+            offsets = [0, *accumulate(item_counts)]
+            transaction_ids = self.generate_transaction_ids(chunk_count)
+            timestamps = self.generate_timestamps(batch_date, chunk_count)
+
+            for i in range(chunk_count):
+                yield self.generate_transaction(
+                    batch_date,
+                    line_items[offsets[i]:offsets[i + 1]],
+                    transaction_ids[i],
+                    customer_pool,
+                    timestamps[i]
+                )
+
+    def generate_batch_metadata(self, count=1000, batch_date=None):
+        """Generate the batch envelope (everything except the transactions)."""
+        if batch_date is None:
+            batch_date = datetime.now()
 
         return {
-            "batch_id": batch_id,
+            "batch_id": f"batch_{batch_date.strftime('%Y%m%d_%H%M%S')}",
             "generated_at": datetime.now().isoformat() + "Z",
             "transaction_count": count,
             "date_range": {
                 "start": (batch_date - timedelta(days=30)).isoformat() + "Z",
                 "end": batch_date.isoformat() + "Z"
-            },
-            "transactions": transactions
+            }
         }
 
+    def generate_batch(self, count=1000, batch_date=None):
+        """Generate a batch of transactions."""
+        if batch_date is None:
+            batch_date = datetime.now()
+
+        batch_data = self.generate_batch_metadata(count, batch_date)
+        batch_data["transactions"] = list(self.iter_transactions(count, batch_date))
+
+        return batch_data
+
     def save_batch(self, batch_data, output_path):
         """Save batch data to JSON file."""
         output_file = Path(output_path)
         output_file.parent.mkdir(parents=True, exist_ok=True)
 
-        with open(output_file, 'w', encoding='utf-8') as f:
-            json.dump(batch_data, f, indent=2, ensure_ascii=False)
+        if orjson is not None:
+            with open(output_file, 'wb') as f:
+                f.write(orjson.dumps(batch_data, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS))
+        else:
+            with open(output_file, 'w', encoding='utf-8') as f:
+                json.dump(batch_data, f, indent=2, ensure_ascii=False)
 
         return output_file
 
+    def save_batch_streaming(self, metadata, transactions, output_path):
+        """
+        Stream a batch to a JSON file one transaction at a time.
+
+        Args:
+            metadata: Batch envelope without the "transactions" key
+            transactions: Iterable of transaction dictionaries
+            output_path: Destination file path
+
+        Returns:
+            Path of the written file
+        """
+        output_file = Path(output_path)
+        output_file.parent.mkdir(parents=True, exist_ok=True)
+
+        if orjson is not None:
+            dumps = orjson.dumps
+        else:
+            def dumps(obj):
+                return json.dumps(obj, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+
+        with open(output_file, 'wb') as f:
+            # Open the envelope, leaving the "transactions" array for the loop below
+            f.write(dumps(metadata)[:-1] + b',"transactions":[\n')
+
+            separator = b""
+            for transaction in transactions:
+                f.write(separator)
+                f.write(dumps(transaction))
+                separator = b",\n"
+
+            f.write(b"\n]}\n")
+
+        return output_file
+
+    def save_batch_ndjson(self, metadata, transactions, output_path):
+        """
+        Stream a batch as newline-delimited JSON (one transaction per line).
+
+        The batch envelope is written to a companion ``<name>.meta`` file (JSON content;
+        the extension keeps it out of the ``*.json`` upload and job-submission filters).
+
+        Args:
+            metadata: Batch envelope without the "transactions" key
+            transactions: Iterable of transaction dictionaries
+            output_path: Destination .ndjson file path
+
+        Returns:
+            Path of the written .ndjson file
+        """
+        output_file = Path(output_path)
+        output_file.parent.mkdir(parents=True, exist_ok=True)
+
+        if orjson is not None:
+            dumps = orjson.dumps
+        else:
+            def dumps(obj):
+                return json.dumps(obj, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+
+        with open(output_file.with_suffix('.meta'), 'wb') as f:
+            f.write(dumps(metadata))
+
+        with open(output_file, 'wb') as f:
+            for transaction in transactions:
+                f.write(dumps(transaction) + b"\n")
+
+        return output_file
+
+
+def _gen_one(job):
+    """
+    Generate and save one batch file (runs in a worker process).
+
+    Args:
+        job: Tuple of (file_index, seed, count, output_dir, output_format)
+
+    Returns:
+        Tuple of (output_path, batch_metadata)
+    """
+    index, seed, count, output_dir, output_format = job
+
+    generator = SyntheticDataGenerator(seed=seed)
+
+    batch_date = datetime.now()
+    batch_metadata = generator.generate_batch_metadata(count=count, batch_date=batch_date)
+
+    # Create filename with index
+    timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+    extension = "ndjson" if output_format == "ndjson" else "json"
+    filename = f"sales_batch_{timestamp}_{index+1:03d}.{extension}"
+    output_path = Path(output_dir) / filename
+
+    transactions = generator.iter_transactions(count=count, batch_date=batch_date)
+
+    if output_format == "pretty":
+        generator.save_batch({**batch_metadata, "transactions": list(transactions)}, output_path)
+    elif output_format == "ndjson":
+        generator.save_batch_ndjson(batch_metadata, transactions, output_path)
+    else:
+        generator.save_batch_streaming(batch_metadata, transactions, output_path)
+
+    return output_path, batch_metadata
+
 
 def main():
     """Main function to handle CLI arguments and generate data."""
@@ -217,37 +436,45 @@ def main():
         help="Random seed for reproducibility (optional)"
     )
 
+    parser.add_argument(
+        "--format",
+        choices=["pretty", "compact", "ndjson"],
+        default="compact",
+        help="Output format: compact JSON (default), indented JSON, or NDJSON with a .meta "
+             "companion (NDJSON is for streaming ingest; the batch processor reads JSON)"
+    )
+
     args = parser.parse_args()
 
     # Create output directory
     output_dir = Path(args.output)
     output_dir.mkdir(parents=True, exist_ok=True)
 
-    # Initialize generator
-    generator = SyntheticDataGenerator(seed=args.seed)
-
     print(f"Generating {args.files} batch file(s) with {args.count} transactions each...")
     print(f"Output directory: {output_dir.absolute()}")
     print("-" * 60)
 
-    # Generate files
-    for i in range(args.files):
-        batch_data = generator.generate_batch(count=args.count)
-
-        # Create filename with index
-        timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-        filename = f"sales_batch_{timestamp}_{i+1:03d}.json"
-        output_path = output_dir / filename
+    # Each file gets its own seed so parallel output stays reproducible
+    jobs = [
+        (i, args.seed + i if args.seed else None, args.count, str(output_dir), args.format)
+        for i in range(args.files)
+    ]
 
-        generator.save_batch(batch_data, output_path)
+    # Generate files (CPU-bound, so fan out across processes)
+    if len(jobs) > 1:
+        with Pool(processes=min(len(jobs), os.cpu_count() or 1)) as pool:
+            results = pool.map(_gen_one, jobs)
+    else:
+        results = [_gen_one(job) for job in jobs]
 
+    for output_path, batch_metadata in results:
         # Calculate file size
         file_size_mb = output_path.stat().st_size / (1024 * 1024)
 
-        print(f"✓ Generated: {filename}")
-        print(f"  - Transactions: {len(batch_data['transactions'])}")
+        print(f"✓ Generated: {output_path.name}")
+        print(f"  - Transactions: {batch_metadata['transaction_count']}")
         print(f"  - File size: {file_size_mb:.2f} MB")
-        print(f"  - Batch ID: {batch_data['batch_id']}")
+        print(f"  - Batch ID: {batch_metadata['batch_id']}")
         print()
 
     print("-" * 60)
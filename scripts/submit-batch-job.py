@@ -9,6 +9,9 @@ Each task processes one JSON file using the Docker container.
 import argparse
 import json
 import sys
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from functools import lru_cache
 from pathlib import Path
 from datetime import datetime, timedelta
 
@@ -19,12 +22,30 @@ from azure.batch.models import (
     TaskAddParameter,
     TaskContainerSettings,
     EnvironmentSetting,
-    OnAllTasksComplete
+    OnAllTasksComplete,
+    PoolListOptions,
+    TaskAddStatus
 )
-from azure.identity import AzureCliCredential, DefaultAzureCredential
+from azure.identity import DefaultAzureCredential
 from azure.storage.blob import BlobServiceClient
-import subprocess
-import json
+
+from cli_token_cache import TOKEN_CACHE_DIR, BatchTokenAuthentication, PersistentCliCredential
+
+
+# On-disk cache of Azure CLI access tokens, so warm runs skip spawning 'az'
+TOKEN_CACHE_FILE = TOKEN_CACHE_DIR / "batch-submit-tokens.json"
+
+TASK_COLLECTION_SIZE = 100  # Maximum tasks accepted by a single add_collection request
+TASK_ADD_MAX_RETRIES = 3
+# Concurrent add_collection requests; kept below the default HTTP connection pool size
+# of the Batch client's requests session so workers never wait on a free connection
+TASK_SUBMIT_WORKERS = 8
+
+
+@lru_cache(maxsize=8)
+def _load_config_cached(path: str, mtime_ns: int, size: int) -> dict:
+    """Parse a config file; the stat fields only serve as the cache key."""
+    return json.loads(Path(path).read_bytes())
 
 
 def load_config(config_path: str = "../config/config.json") -> dict:
@@ -36,17 +57,19 @@ def load_config(config_path: str = "../config/config.json") -> dict:
         print("Please create config/config.json from config/config.sample.json")
         sys.exit(1)
 
-    with open(config_file, 'r') as f:
-        return json.load(f)
+    stat = config_file.stat()
+    return _load_config_cached(str(config_file.resolve()), stat.st_mtime_ns, stat.st_size)
 
 
-def list_input_blobs(storage_account: str, container_name: str) -> list:
+def list_input_blobs(storage_account: str, container_name: str, credential, prefix: str = "") -> list:
     """
     List all blobs in the input container.
 
     Args:
         storage_account: Storage account name
         container_name: Container name
+        credential: Token credential for the storage account
+        prefix: Only list blobs whose names start with this prefix (filtered server-side)
 
     Returns:
         List of blob names
@@ -54,7 +77,6 @@ def list_input_blobs(storage_account: str, container_name: str) -> list:
     print(f"Listing blobs in {container_name}...")
 
     try:
-        credential = AzureCliCredential()
         account_url = f"https://{storage_account}.blob.core.windows.net"
 
         blob_service_client = BlobServiceClient(
@@ -63,9 +85,13 @@ def list_input_blobs(storage_account: str, container_name: str) -> list:
         )
 
         container_client = blob_service_client.get_container_client(container_name)
-        blob_list = list(container_client.list_blobs())
-
-        blob_names = [blob.name for blob in blob_list if blob.name.endswith('.json')]
+        # list_blob_names skips deserializing the full BlobProperties of every blob;
+        # requesting the service maximum page size keeps listing round-trips to a minimum
+        blob_names = [
+            name
+            for name in container_client.list_blob_names(name_starts_with=prefix or None, results_per_page=5000)
+            if name.endswith('.json')
+        ]
 
         print(f"✓ Found {len(blob_names)} JSON file(s)")
         return blob_names
@@ -75,6 +101,70 @@ def list_input_blobs(storage_account: str, container_name: str) -> list:
         sys.exit(1)
 
 
+def submit_task_collection(
+    batch_client: BatchServiceClient,
+    job_id: str,
+    tasks: list,
+    blob_by_task: dict
+) -> tuple:
+    """
+    Add a collection of tasks to a job, retrying tasks that hit server errors.
+
+    Args:
+        batch_client: Batch service client
+        job_id: Job ID
+        tasks: TaskAddParameter objects to add (at most TASK_COLLECTION_SIZE)
+        blob_by_task: Mapping of task ID to the blob name it processes
+
+    Returns:
+        Tuple of (tasks created, tasks failed)
+    """
+    tasks_created = 0
+    tasks_failed = 0
+    pending = tasks
+
+    for attempt in range(TASK_ADD_MAX_RETRIES + 1):
+        if attempt:
+            time.sleep(2 ** (attempt - 1))
+
+        try:
+            result = batch_client.task.add_collection(job_id=job_id, value=pending)
+        except Exception as e:
+            if attempt == TASK_ADD_MAX_RETRIES:
+                for task in pending:
+                    print(f"✗ Task {task.id} failed: {str(e)}")
+                return tasks_created, tasks_failed + len(pending)
+            continue
+
+        pending_by_id = {task.id: task for task in pending}
+        retry = []
+
+        for task_result in result.value:
+            task_id = task_result.task_id
+            error = task_result.error
+
+            if task_result.status == TaskAddStatus.success:
+                print(f"✓ Task {task_id}: {blob_by_task[task_id]}")
+                tasks_created += 1
+            elif error is not None and error.code == "TaskExists":
+                print(f"  Task {task_id} already exists, skipping")
+            elif task_result.status == TaskAddStatus.server_error:
+                retry.append(pending_by_id[task_id])
+            else:
+                message = error.message.value if error is not None and error.message else "unknown error"
+                print(f"✗ Task {task_id} failed: {message}")
+                tasks_failed += 1
+
+        pending = retry
+        if not pending:
+            break
+
+    for task in pending:
+        print(f"✗ Task {task.id} failed: server error after {TASK_ADD_MAX_RETRIES} retries")
+
+    return tasks_created, tasks_failed + len(pending)
+
+
 def create_batch_job(
     batch_client: BatchServiceClient,
     job_id: str,
@@ -132,57 +222,67 @@ def create_batch_job(
     print(f"\nCreating {len(blob_names)} task(s)...")
     print("-" * 60)
 
-    tasks_created = 0
-    tasks_failed = 0
+    # Environment variables for the container
+    # Include managed identity client ID if defined in config to ensure the correct user-assigned identity is used
+    mi_client_id = config["azure"].get("identity", {}).get("client_id")
+
+    # Container settings - let the container use its default entrypoint and command
+    container_settings = TaskContainerSettings(
+        image_name=acr_image,
+        container_run_options="--rm --workdir /app"  # Ensure correct working directory
+    )
+
+    # Settings shared by every task are built once; only the blob and task ID vary
+    shared_environment_settings = [
+        EnvironmentSetting(name="STORAGE_ACCOUNT_NAME", value=storage_account),
+        EnvironmentSetting(name="INPUT_CONTAINER", value=input_container),
+        EnvironmentSetting(name="OUTPUT_CONTAINER", value=output_container),
+        EnvironmentSetting(name="LOGS_CONTAINER", value=logs_container),
+        EnvironmentSetting(name="JOB_ID", value=job_id),
+    ]
+
+    if mi_client_id:
+        shared_environment_settings.append(EnvironmentSetting(name="MANAGED_IDENTITY_CLIENT_ID", value=mi_client_id))
+
+    tasks = []
+    blob_by_task = {}
 
     for idx, blob_name in enumerate(blob_names):
         task_id = f"task-{idx}"
 
-        try:
-            # Environment variables for the container
-            # Include managed identity client ID if defined in config to ensure the correct user-assigned identity is used
-            mi_client_id = config["azure"].get("identity", {}).get("client_id")
-
-            environment_settings = [
-                EnvironmentSetting(name="STORAGE_ACCOUNT_NAME", value=storage_account),
-                EnvironmentSetting(name="INPUT_CONTAINER", value=input_container),
-                EnvironmentSetting(name="OUTPUT_CONTAINER", value=output_container),
-                EnvironmentSetting(name="LOGS_CONTAINER", value=logs_container),
-                EnvironmentSetting(name="INPUT_BLOB_NAME", value=blob_name),
-                EnvironmentSetting(name="JOB_ID", value=job_id),
-                EnvironmentSetting(name="TASK_ID", value=task_id),
-            ]
-
-            if mi_client_id:
-                environment_settings.append(EnvironmentSetting(name="MANAGED_IDENTITY_CLIENT_ID", value=mi_client_id))
-
-            # Container settings - let the container use its default entrypoint and command
-            container_settings = TaskContainerSettings(
-                image_name=acr_image,
-                container_run_options="--rm --workdir /app"  # Ensure correct working directory
-            )
-
-            # Create task with empty command_line to use container's default CMD
-            # The Dockerfile defines: ENTRYPOINT ["python", "-u"] and CMD ["processor/main.py"]
-            # This will effectively run: python -u processor/main.py
-            task = TaskAddParameter(
-                id=task_id,
-                command_line="",  # Empty command line lets container run its default CMD
-                container_settings=container_settings,
-                environment_settings=environment_settings
-            )
-
-            batch_client.task.add(job_id=job_id, task=task)
-
-            print(f"✓ Task {task_id}: {blob_name}")
-            tasks_created += 1
+        environment_settings = shared_environment_settings + [
+            EnvironmentSetting(name="INPUT_BLOB_NAME", value=blob_name),
+            EnvironmentSetting(name="TASK_ID", value=task_id),
+        ]
+
+        # Create task with empty command_line to use container's default CMD
+        # The Dockerfile defines: ENTRYPOINT ["python", "-u"] and CMD ["processor/main.py"]
+        # This will effectively run: python -u processor/main.py
+        tasks.append(TaskAddParameter(
+            id=task_id,
+            command_line="",  # Empty command line lets container run its default CMD
+            container_settings=container_settings,
+            environment_settings=environment_settings
+        ))
+        blob_by_task[task_id] = blob_name
 
-        except Exception as e:
-            if "TaskExists" in str(e):
-                print(f"  Task {task_id} already exists, skipping")
-            else:
-                print(f"✗ Task {task_id} failed: {str(e)}")
-                tasks_failed += 1
+    tasks_created = 0
+    tasks_failed = 0
+
+    # Submit tasks in bulk: one request per TASK_COLLECTION_SIZE tasks instead of one per task,
+    # with independent collections in flight concurrently so their round-trips overlap
+    chunks = [tasks[start:start + TASK_COLLECTION_SIZE] for start in range(0, len(tasks), TASK_COLLECTION_SIZE)]
+
+    with ThreadPoolExecutor(max_workers=max(1, min(TASK_SUBMIT_WORKERS, len(chunks)))) as executor:
+        futures = [
+            executor.submit(submit_task_collection, batch_client, job_id, chunk, blob_by_task)
+            for chunk in chunks
+        ]
+
+        for future in as_completed(futures):
+            created, failed = future.result()
+            tasks_created += created
+            tasks_failed += failed
 
     # Summary
     print("\n" + "=" * 60)
@@ -234,6 +334,13 @@ def main():
         help="Job ID (default: auto-generated with timestamp)"
     )
 
+    parser.add_argument(
+        "--prefix",
+        type=str,
+        default="",
+        help="Only process input blobs with this prefix (optional)"
+    )
+
     parser.add_argument(
         "--config",
         type=str,
@@ -261,31 +368,23 @@ def main():
     # Authenticate with Azure Batch
     print("Authenticating to Azure Batch...")
     try:
-        # Get access token from Azure CLI using shell=True for Windows
-        result = subprocess.run(
-            'az account get-access-token --resource https://batch.core.windows.net/',
-            shell=True,
-            capture_output=True,
-            text=True,
-            check=True
-        )
-        token_data = json.loads(result.stdout)
-        access_token = token_data['accessToken']
-        
-        # Create a simple token credential
-        from msrest.authentication import BasicTokenAuthentication
-        credentials = BasicTokenAuthentication({'access_token': access_token})
-        
+        # Tokens come from the Azure CLI login and are reused across runs until near expiry
+        credential = PersistentCliCredential(TOKEN_CACHE_FILE)
+        credentials = BatchTokenAuthentication(credential)
+
         batch_account_url = config["azure"]["batch"]["account_url"]
 
         batch_client = BatchServiceClient(
             credentials=credentials,
             batch_url=batch_account_url
         )
+        # msrest closes its requests session after every call unless keep_alive is set,
+        # which would cost a new TCP/TLS handshake per request
+        batch_client.config.keep_alive = True
 
-        # Test connection by listing pools
-        pools = list(batch_client.pool.list())
-        print(f"✓ Connected to Batch account ({len(pools)} pool(s) available)")
+        # Test connection by counting pools; only IDs are requested and nothing is kept
+        pool_count = sum(1 for _ in batch_client.pool.list(pool_list_options=PoolListOptions(select="id")))
+        print(f"✓ Connected to Batch account ({pool_count} pool(s) available)")
 
     except Exception as e:
         print(f"✗ Authentication failed: {str(e)}")
@@ -314,7 +413,7 @@ def main():
     storage_account = config["azure"]["storage"]["account_name"]
     input_container = config["azure"]["storage"]["input_container"]
 
-    blob_names = list_input_blobs(storage_account, input_container)
+    blob_names = list_input_blobs(storage_account, input_container, credential, args.prefix)
 
     if not blob_names:
         print("\nNo JSON files found in input container")
@@ -7,10 +7,26 @@ Helps diagnose common issues with Azure Batch jobs.
 
 import argparse
 import json
-import subprocess
 import sys
+from concurrent.futures import ThreadPoolExecutor
+from itertools import islice
+from functools import lru_cache
 from pathlib import Path
 
+from azure.batch import BatchServiceClient
+from azure.batch.models import TaskListOptions
+from azure.identity import AzureCliCredential
+
+from cli_token_cache import BatchTokenAuthentication
+
+TASK_FILE_WORKERS = 8
+
+
+@lru_cache(maxsize=8)
+def _load_config_cached(path: str, mtime_ns: int, size: int) -> dict:
+    """Parse a config file; the stat fields only serve as the cache key."""
+    return json.loads(Path(path).read_bytes())
+
 
 def load_config(config_path: str = "../config/config.json") -> dict:
     """Load configuration from JSON file."""
@@ -20,186 +36,201 @@ def load_config(config_path: str = "../config/config.json") -> dict:
         print(f"Error: Configuration file not found at {config_file}")
         return None
     
-    with open(config_file, 'r') as f:
-        return json.load(f)
+    stat = config_file.stat()
+    return _load_config_cached(str(config_file.resolve()), stat.st_mtime_ns, stat.st_size)
 
 
-def run_command(cmd: str, description: str) -> tuple:
-    """Run a command and return result."""
-    print(f"🔍 {description}")
-    print(f"   Command: {cmd}")
-    
-    try:
-        result = subprocess.run(cmd, shell=True, capture_output=True, text=True, check=False)
-        return result.returncode, result.stdout, result.stderr
-    except Exception as e:
-        return -1, "", str(e)
+def create_batch_client(config: dict) -> BatchServiceClient:
+    """Create a Batch client authenticated with the Azure CLI login."""
+    credentials = BatchTokenAuthentication(AzureCliCredential())
 
+    batch_client = BatchServiceClient(
+        credentials=credentials,
+        batch_url=config["azure"]["batch"]["account_url"]
+    )
 
-def check_job_status(job_id: str, config: dict):
+    # msrest closes its requests session after every call unless keep_alive is set,
+    # which would cost a new TCP/TLS handshake per request
+    batch_client.config.keep_alive = True
+
+    return batch_client
+
+
+def _value(value):
+    """Return the plain value of an SDK enum (or the value itself)."""
+    return getattr(value, "value", value)
+
+
+def check_job_status(batch_client: BatchServiceClient, job_id: str):
     """Check job and task status."""
     print("\n" + "="*60)
     print("JOB STATUS ANALYSIS")
     print("="*60)
     
-    batch_account = config["azure"]["batch"]["account_name"]
-    batch_url = config["azure"]["batch"]["account_url"]
-    
     # Check job status
-    cmd = f'az batch job show --job-id {job_id} --account-name {batch_account} --account-endpoint {batch_url} --output json'
-    code, stdout, stderr = run_command(cmd, "Checking job status")
+    print("🔍 Checking job status")
     
-    if code == 0:
-        try:
-            job_data = json.loads(stdout)
-            print(f"✅ Job Status: {job_data.get('state', 'Unknown')}")
-            print(f"   Pool ID: {job_data.get('poolInfo', {}).get('poolId', 'Unknown')}")
-            print(f"   Creation Time: {job_data.get('creationTime', 'Unknown')}")
-            
-            if 'executionInfo' in job_data:
-                exec_info = job_data['executionInfo']
-                print(f"   Start Time: {exec_info.get('startTime', 'Not started')}")
-                print(f"   End Time: {exec_info.get('endTime', 'Not finished')}")
-            
-        except json.JSONDecodeError:
-            print(f"❌ Failed to parse job data")
-            print(f"Raw output: {stdout[:500]}")
-    else:
-        print(f"❌ Job not found or error: {stderr}")
+    try:
+        job = batch_client.job.get(job_id)
+        print(f"✅ Job Status: {_value(job.state) or 'Unknown'}")
+        print(f"   Pool ID: {job.pool_info.pool_id if job.pool_info else 'Unknown'}")
+        print(f"   Creation Time: {job.creation_time or 'Unknown'}")
+        
+        if job.execution_info:
+            exec_info = job.execution_info
+            print(f"   Start Time: {exec_info.start_time or 'Not started'}")
+            print(f"   End Time: {exec_info.end_time or 'Not finished'}")
+        
+    except Exception as e:
+        print(f"❌ Job not found or error: {e}")
     
     # List tasks
-    cmd = f'az batch task list --job-id {job_id} --account-name {batch_account} --account-endpoint {batch_url} --output json'
-    code, stdout, stderr = run_command(cmd, "Listing tasks")
+    print("🔍 Listing tasks")
     
-    if code == 0:
-        try:
-            tasks = json.loads(stdout)
-            print(f"\n📋 Found {len(tasks)} task(s):")
+    try:
+        # Only the fields printed below; full task records make the list response large on big jobs
+        tasks = list(batch_client.task.list(
+            job_id,
+            task_list_options=TaskListOptions(select="id,state,executionInfo")
+        ))
+        print(f"\n📋 Found {len(tasks)} task(s):")
+        
+        for task in tasks:
+            print(f"   Task {task.id}: {_value(task.state) or 'Unknown'}")
             
-            for task in tasks:
-                task_id = task.get('id', 'Unknown')
-                state = task.get('state', 'Unknown')
-                print(f"   Task {task_id}: {state}")
+            # Check for execution info
+            if task.execution_info:
+                exec_info = task.execution_info
+                if exec_info.exit_code is not None:
+                    print(f"     Exit Code: {exec_info.exit_code}")
                 
-                # Check for execution info
-                if 'executionInfo' in task:
-                    exec_info = task['executionInfo']
-                    exit_code = exec_info.get('exitCode')
-                    if exit_code is not None:
-                        print(f"     Exit Code: {exit_code}")
-                    
-                    if 'failureInfo' in exec_info:
-                        failure = exec_info['failureInfo']
-                        print(f"     ❌ Failure Category: {failure.get('category', 'Unknown')}")
-                        print(f"     ❌ Failure Code: {failure.get('code', 'Unknown')}")
-                        print(f"     ❌ Failure Message: {failure.get('message', 'Unknown')}")
-                
-        except json.JSONDecodeError:
-            print(f"❌ Failed to parse tasks data")
-    else:
-        print(f"❌ Failed to list tasks: {stderr}")
+                if exec_info.failure_info:
+                    failure = exec_info.failure_info
+                    print(f"     ❌ Failure Category: {_value(failure.category) or 'Unknown'}")
+                    print(f"     ❌ Failure Code: {failure.code or 'Unknown'}")
+                    print(f"     ❌ Failure Message: {failure.message or 'Unknown'}")
+            
+    except Exception as e:
+        print(f"❌ Failed to list tasks: {e}")
+
+
+def _download_task_file(batch_client: BatchServiceClient, job_id: str, task_id: str, name: str,
+                        output_file: Path) -> Path:
+    """Stream a task file to disk as the service returns it."""
+    with open(output_file, "wb") as f:
+        for data in batch_client.file.get_from_task(job_id, task_id, name):
+            f.write(data)
+    
+    return output_file
 
 
-def check_task_files(job_id: str, task_id: str, config: dict):
+def check_task_files(batch_client: BatchServiceClient, job_id: str, task_id: str):
     """Check task output files."""
     print("\n" + "="*60)
     print(f"TASK FILES ANALYSIS - {task_id}")
     print("="*60)
     
-    batch_account = config["azure"]["batch"]["account_name"]
-    batch_url = config["azure"]["batch"]["account_url"]
-    
     # List task files
-    cmd = f'az batch task file list --job-id {job_id} --task-id {task_id} --account-name {batch_account} --account-endpoint {batch_url} --output json'
-    code, stdout, stderr = run_command(cmd, f"Listing files for task {task_id}")
+    print(f"🔍 Listing files for task {task_id}")
+    
+    try:
+        files = list(batch_client.file.list_from_task(job_id, task_id))
+    except Exception as e:
+        print(f"❌ Failed to list files: {e}")
+        return
     
-    if code == 0:
+    print(f"📁 Found {len(files)} file(s):")
+    
+    downloads = []
+    for file_info in files:
+        name = file_info.name
+        size = file_info.properties.content_length if file_info.properties else 0
+        print(f"   {name} ({size} bytes)")
+        
+        # Download key files for analysis
+        if name in ['stdout.txt', 'stderr.txt']:
+            downloads.append(name)
+    
+    if not downloads:
+        return
+    
+    output_dir = Path("logs")
+    output_dir.mkdir(exist_ok=True)
+    
+    # Fetch the log files concurrently, then report them in listing order
+    with ThreadPoolExecutor(max_workers=min(TASK_FILE_WORKERS, len(downloads))) as executor:
+        futures = {
+            name: executor.submit(
+                _download_task_file, batch_client, job_id, task_id, name,
+                output_dir / f"{job_id}_{task_id}_{name}"
+            )
+            for name in downloads
+        }
+    
+    for name, future in futures.items():
+        print(f"🔍 Downloading {name}")
+        
         try:
-            files = json.loads(stdout)
-            print(f"📁 Found {len(files)} file(s):")
-            
-            for file_info in files:
-                name = file_info.get('name', 'Unknown')
-                size = file_info.get('properties', {}).get('contentLength', 0)
-                print(f"   {name} ({size} bytes)")
-                
-                # Download key files for analysis
-                if name in ['stdout.txt', 'stderr.txt']:
-                    output_dir = Path("logs")
-                    output_dir.mkdir(exist_ok=True)
-                    
-                    output_file = output_dir / f"{job_id}_{task_id}_{name}"
-                    
-                    download_cmd = f'az batch task file download --job-id {job_id} --task-id {task_id} --file-path {name} --destination {output_file} --account-name {batch_account} --account-endpoint {batch_url}'
-                    
-                    dl_code, dl_stdout, dl_stderr = run_command(download_cmd, f"Downloading {name}")
-                    
-                    if dl_code == 0:
-                        print(f"     ✅ Downloaded to {output_file}")
-                        
-                        # Show content if small enough
-                        if output_file.exists() and output_file.stat().st_size < 2000:
-                            content = output_file.read_text(encoding='utf-8', errors='ignore')
-                            if content.strip():
-                                print(f"     Content:")
-                                for line in content.split('\n')[:10]:  # Show first 10 lines
-                                    print(f"       {line}")
-                                if len(content.split('\n')) > 10:
-                                    print(f"       ... (truncated)")
-                    else:
-                        print(f"     ❌ Failed to download: {dl_stderr}")
+            output_file = future.result()
+        except Exception as e:
+            print(f"     ❌ Failed to download: {e}")
+            continue
         
-        except json.JSONDecodeError:
-            print(f"❌ Failed to parse files data")
-    else:
-        print(f"❌ Failed to list files: {stderr}")
+        print(f"     ✅ Downloaded to {output_file}")
+        
+        # Show content if small enough
+        if output_file.stat().st_size < 2000:
+            # Read only the lines shown, plus one to tell whether there is more
+            with open(output_file, 'r', encoding='utf-8', errors='ignore') as f:
+                lines = list(islice(f, 11))
+            
+            if any(line.strip() for line in lines):
+                print(f"     Content:")
+                for line in lines[:10]:  # Show first 10 lines
+                    print("       " + line.rstrip("\n"))
+                if len(lines) > 10:
+                    print(f"       ... (truncated)")
 
 
-def check_pool_status(config: dict):
+def check_pool_status(batch_client: BatchServiceClient, config: dict):
     """Check pool status."""
     print("\n" + "="*60)
     print("POOL STATUS ANALYSIS")
     print("="*60)
     
-    batch_account = config["azure"]["batch"]["account_name"]
-    batch_url = config["azure"]["batch"]["account_url"]
     pool_id = config["azure"]["batch"]["pool_id"]
     
     # Check pool status
-    cmd = f'az batch pool show --pool-id {pool_id} --account-name {batch_account} --account-endpoint {batch_url} --output json'
-    code, stdout, stderr = run_command(cmd, f"Checking pool {pool_id}")
+    print(f"🔍 Checking pool {pool_id}")
     
-    if code == 0:
-        try:
-            pool_data = json.loads(stdout)
-            print(f"✅ Pool Status: {pool_data.get('state', 'Unknown')}")
-            print(f"   VM Size: {pool_data.get('vmSize', 'Unknown')}")
-            print(f"   Dedicated Nodes: {pool_data.get('currentDedicatedNodes', 0)}")
-            print(f"   Low Priority Nodes: {pool_data.get('currentLowPriorityNodes', 0)}")
-            
-            # Check autoscale
-            if 'autoScaleFormula' in pool_data:
-                print(f"   Autoscale: Enabled")
-            else:
-                print(f"   Target Dedicated: {pool_data.get('targetDedicatedNodes', 0)}")
-                print(f"   Target Low Priority: {pool_data.get('targetLowPriorityNodes', 0)}")
-            
-            # Check container configuration
-            if 'deploymentConfiguration' in pool_data:
-                vm_config = pool_data['deploymentConfiguration'].get('virtualMachineConfiguration', {})
-                if 'containerConfiguration' in vm_config:
-                    container_config = vm_config['containerConfiguration']
-                    print(f"   Container Type: {container_config.get('type', 'Unknown')}")
-                    
-                    images = container_config.get('containerImageNames', [])
-                    print(f"   Container Images: {len(images)}")
-                    for img in images:
-                        print(f"     - {img}")
-            
-        except json.JSONDecodeError:
-            print(f"❌ Failed to parse pool data")
+    try:
+        pool = batch_client.pool.get(pool_id)
+    except Exception as e:
+        print(f"❌ Pool not found or error: {e}")
+        return
+    
+    print(f"✅ Pool Status: {_value(pool.state) or 'Unknown'}")
+    print(f"   VM Size: {pool.vm_size or 'Unknown'}")
+    print(f"   Dedicated Nodes: {pool.current_dedicated_nodes or 0}")
+    print(f"   Low Priority Nodes: {pool.current_low_priority_nodes or 0}")
+    
+    # Check autoscale
+    if pool.enable_auto_scale:
+        print(f"   Autoscale: Enabled")
     else:
-        print(f"❌ Pool not found or error: {stderr}")
+        print(f"   Target Dedicated: {pool.target_dedicated_nodes or 0}")
+        print(f"   Target Low Priority: {pool.target_low_priority_nodes or 0}")
+    
+    # Check container configuration
+    vm_config = pool.virtual_machine_configuration
+    if vm_config and vm_config.container_configuration:
+        container_config = vm_config.container_configuration
+        print(f"   Container Type: {_value(container_config.type) or 'Unknown'}")
+        
+        images = container_config.container_image_names or []
+        print(f"   Container Images: {len(images)}")
+        for img in images:
+            print(f"     - {img}")
 
 
 def main():
@@ -223,17 +254,26 @@ def main():
     print(f"Batch Account: {config['azure']['batch']['account_name']}")
     print(f"Pool ID: {config['azure']['batch']['pool_id']}")
     
+    if args.check_pool or args.job_id:
+        # One authenticated client (and connection pool) serves every check
+        try:
+            batch_client = create_batch_client(config)
+        except Exception as e:
+            print(f"❌ Authentication failed: {e}")
+            print("   Please ensure you are logged in with 'az login'")
+            sys.exit(1)
+    
     if args.check_pool:
-        check_pool_status(config)
+        check_pool_status(batch_client, config)
     
     if args.job_id:
-        check_job_status(args.job_id, config)
+        check_job_status(batch_client, args.job_id)
         
         if args.task_id:
-            check_task_files(args.job_id, args.task_id, config)
+            check_task_files(batch_client, args.job_id, args.task_id)
         else:
             # Try to analyze first task
-            check_task_files(args.job_id, "task-0", config)
+            check_task_files(batch_client, args.job_id, "task-0")
     
     if not args.job_id and not args.check_pool:
         print("\n💡 Usage examples:")
@@ -7,12 +7,62 @@ using Azure CLI authentication.
 """
 
 import argparse
+import asyncio
+import fnmatch
+import hashlib
 import json
+import mmap
+import os
 import sys
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, as_completed, wait
+from contextlib import contextmanager
+from itertools import chain
+from functools import lru_cache
 from pathlib import Path
-from azure.storage.blob import BlobServiceClient
+import aiohttp
+import requests
+from azure.core.credentials import AccessToken
+from azure.core.exceptions import ResourceNotFoundError
+from azure.core.pipeline.transport import AioHttpTransport, RequestsTransport
+from azure.storage.blob import BlobServiceClient, ContentSettings
+from azure.storage.blob.aio import BlobServiceClient as AsyncBlobServiceClient
 from azure.identity import AzureCliCredential
 
+PER_BLOB_CONCURRENCY = 4
+KEEPALIVE_TIMEOUT_SECONDS = 60
+HASH_CHUNK_SIZE = 4 * 1024 * 1024
+PROGRESS_INTERVAL = 100  # Successful uploads are reported in batches of this many files
+MMAP_THRESHOLD = 4 * 1024 * 1024  # Smaller files upload from the plain file object
+JSON_CONTENT_SETTINGS = ContentSettings(content_type="application/json")
+
+# Containers already known to exist in this process; skips the create-on-missing path
+_VERIFIED_CONTAINERS: set = set()
+
+
+class AsyncCredentialAdapter:
+    """Expose a synchronous token credential to the asyncio SDK clients."""
+
+    def __init__(self, credential):
+        self._credential = credential
+
+    async def get_token(self, *scopes, **kwargs) -> AccessToken:
+        return await asyncio.to_thread(self._credential.get_token, *scopes, **kwargs)
+
+    async def close(self):
+        pass
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *args):
+        pass
+
+
+@lru_cache(maxsize=8)
+def _load_config_cached(path: str, mtime_ns: int, size: int) -> dict:
+    """Parse a config file; the stat fields only serve as the cache key."""
+    return json.loads(Path(path).read_bytes())
+
 
 def load_config(config_path: str = "../config/config.json") -> dict:
     """Load configuration from JSON file."""
@@ -23,11 +73,364 @@ def load_config(config_path: str = "../config/config.json") -> dict:
         print("Please create config/config.json from config/config.sample.json")
         sys.exit(1)
 
-    with open(config_file, 'r') as f:
-        return json.load(f)
+    stat = config_file.stat()
+    return _load_config_cached(str(config_file.resolve()), stat.st_mtime_ns, stat.st_size)
+
+
+def confirm_create_container(container_name: str):
+    """
+    Ask whether to create a container that an upload found missing; exit if declined.
+
+    Args:
+        container_name: Container name
+    """
+    print(f"\nWarning: Container '{container_name}' does not exist")
+    response = input("Create container? (y/n): ")
+    if response.lower() != 'y':
+        print("Upload cancelled")
+        sys.exit(0)
+
+
+@contextmanager
+def _open_for_upload(file_path: Path, file_size: int):
+    """Open a file for uploading, memory-mapping it when it is large."""
+    with open(file_path, "rb") as data:
+        if file_size < MMAP_THRESHOLD:
+            yield data
+        else:
+            # Let the uploader read chunks straight from the page cache instead of
+            # through the buffered file object
+            with mmap.mmap(data.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                yield mapped
+
 
+def _stream_md5(stream) -> bytes:
+    """Return the MD5 digest of an upload stream and rewind it."""
+    if isinstance(stream, mmap.mmap):
+        # Hash the mapped pages directly, without copying them into Python bytes
+        return hashlib.md5(stream).digest()
 
-def upload_files(storage_account: str, container_name: str, local_path: str, pattern: str = "*.json"):
+    digest = hashlib.md5()
+    for chunk in iter(lambda: stream.read(HASH_CHUNK_SIZE), b""):
+        digest.update(chunk)
+    stream.seek(0)
+    return digest.digest()
+
+
+def _content_settings(content_md5: bytes, file_path: Path, remote_md5s: dict):
+    """
+    Build the content settings for an upload, or None when the blob is unchanged.
+
+    Args:
+        content_md5: MD5 digest of the file (from _stream_md5), or None when remote_md5s is None
+        file_path: Local file being uploaded
+        remote_md5s: Mapping of blob name to stored Content-MD5, or None to always upload
+
+    Returns:
+        ContentSettings to upload with, or None if the blob already has identical content
+    """
+    if remote_md5s is None:
+        return JSON_CONTENT_SETTINGS
+
+    if remote_md5s.get(file_path.name) == content_md5:
+        return None
+
+    # Store the hash on the blob so later runs can skip it, even for block uploads
+    return ContentSettings(content_type="application/json", content_md5=content_md5)
+
+
+def _upload_one(container_client, file_path: Path, file_size: int, remote_md5s: dict = None) -> bool:
+    """Upload a single file to a blob named after it; return False if it was skipped as unchanged."""
+    blob_client = container_client.get_blob_client(file_path.name)
+
+    with _open_for_upload(file_path, file_size) as stream:
+        content_md5 = _stream_md5(stream) if remote_md5s is not None else None
+        content_settings = _content_settings(content_md5, file_path, remote_md5s)
+        if content_settings is None:
+            return False
+
+        blob_client.upload_blob(
+            stream,
+            overwrite=True,
+            length=file_size,
+            max_concurrency=PER_BLOB_CONCURRENCY,
+            content_settings=content_settings
+        )
+
+    return True
+
+
+async def _upload_one_async(container_client, file_path: Path, file_size: int, remote_md5s: dict = None) -> bool:
+    """Upload a single file with the asyncio SDK; return False if it was skipped as unchanged."""
+    blob_client = container_client.get_blob_client(file_path.name)
+
+    with _open_for_upload(file_path, file_size) as stream:
+        # Hash off the event loop so a large file does not stall the other uploads
+        content_md5 = await asyncio.to_thread(_stream_md5, stream) if remote_md5s is not None else None
+        content_settings = _content_settings(content_md5, file_path, remote_md5s)
+        if content_settings is None:
+            return False
+
+        await blob_client.upload_blob(
+            stream,
+            overwrite=True,
+            length=file_size,
+            max_concurrency=PER_BLOB_CONCURRENCY,
+            content_settings=content_settings
+        )
+
+    return True
+
+
+def list_remote_md5s(container_client) -> dict:
+    """Map each blob in the container to its stored Content-MD5 with a single listing."""
+    return {
+        blob.name: bytes(blob.content_settings.content_md5)
+        for blob in container_client.list_blobs(results_per_page=5000)
+        if blob.content_settings.content_md5
+    }
+
+
+async def list_remote_md5s_async(container_client) -> dict:
+    """Map each blob in the container to its stored Content-MD5 with a single listing."""
+    return {
+        blob.name: bytes(blob.content_settings.content_md5)
+        async for blob in container_client.list_blobs(results_per_page=5000)
+        if blob.content_settings.content_md5
+    }
+
+
+def _report_upload(file_path: Path, file_size: int, future) -> bool:
+    """Print a failed upload and return whether the upload succeeded (or was skipped)."""
+    try:
+        future.result()
+        return True
+
+    except Exception as e:
+        file_size_mb = file_size / (1024 * 1024)
+        print(f"\nUploading: {file_path.name} ({file_size_mb:.2f} MB)")
+        print(f"  ✗ Upload failed: {str(e)}")
+        return False
+
+
+def _report_progress(completed: int):
+    """Print a progress line every PROGRESS_INTERVAL files."""
+    if completed % PROGRESS_INTERVAL == 0:
+        print(f"  ✓ {completed} file(s) processed")
+
+
+def iter_upload_files(local_path_obj: Path, pattern: str = "*.json"):
+    """
+    Yield the files to upload, with their sizes, as the directory is walked.
+
+    Args:
+        local_path_obj: Local file or directory
+        pattern: File pattern to match within a directory
+
+    Yields:
+        Tuples of (file path, size in bytes)
+    """
+    if local_path_obj.is_file():
+        yield local_path_obj, local_path_obj.stat().st_size
+        return
+
+    if "/" in pattern or os.sep in pattern or "**" in pattern:
+        for file_path in local_path_obj.glob(pattern):
+            if file_path.is_file():
+                yield file_path, file_path.stat().st_size
+        return
+
+    # Flat patterns are matched on scandir entries, so no Path is built for
+    # entries that don't match
+    with os.scandir(local_path_obj) as entries:
+        for entry in entries:
+            if fnmatch.fnmatch(entry.name, pattern) and entry.is_file():
+                yield Path(entry.path), entry.stat().st_size
+
+
+def upload_files_threaded(account_url: str, credential, container_name: str, files, workers: int = 16,
+                          skip_unchanged: bool = False) -> tuple:
+    """
+    Upload files with a thread pool, starting before the directory walk finishes.
+
+    Args:
+        account_url: Blob service account URL
+        credential: Synchronous token credential
+        container_name: Container name
+        files: Non-empty iterator of (file path, size in bytes) to upload
+        workers: Number of files to upload concurrently
+        skip_unchanged: Skip files whose MD5 matches the existing blob's Content-MD5
+
+    Returns:
+        Tuple of (uploaded_count, skipped_count, failed_count, total_count)
+    """
+    uploaded_count = 0
+    skipped_count = 0
+    failed_count = 0
+    total_count = 0
+
+    # The default urllib3 pool keeps 10 connections per host, which would
+    # serialize concurrent uploads on connection checkout
+    session = requests.Session()
+    adapter = requests.adapters.HTTPAdapter(pool_maxsize=max(32, workers * PER_BLOB_CONCURRENCY))
+    session.mount("https://", adapter)
+
+    blob_service_client = BlobServiceClient(
+        account_url=account_url,
+        credential=credential,
+        transport=RequestsTransport(session=session, session_owner=False)
+    )
+
+    # Existence is not checked up front: a missing container surfaces as
+    # ResourceNotFoundError on the first upload instead
+    container_client = blob_service_client.get_container_client(container_name)
+
+    remote_md5s = None
+    if skip_unchanged:
+        try:
+            remote_md5s = list_remote_md5s(container_client)
+        except ResourceNotFoundError:
+            remote_md5s = {}
+
+    # In-flight work is capped to bound memory on very large directories
+    max_in_flight = workers * 4
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        pending = {}
+
+        def _collect(done):
+            nonlocal uploaded_count, skipped_count, failed_count
+            for future in done:
+                file_path, file_size = pending.pop(future)
+                if not _report_upload(file_path, file_size, future):
+                    failed_count += 1
+                elif future.result():
+                    uploaded_count += 1
+                else:
+                    skipped_count += 1
+                _report_progress(uploaded_count + skipped_count + failed_count)
+
+        # The first upload finishes before the rest are submitted so a missing
+        # container can be created interactively on this thread
+        first_file, first_size = next(files)
+        first_future = executor.submit(_upload_one, container_client, first_file, first_size, remote_md5s)
+
+        if container_name not in _VERIFIED_CONTAINERS and isinstance(first_future.exception(), ResourceNotFoundError):
+            confirm_create_container(container_name)
+            container_client.create_container()
+            print(f"✓ Created container: {container_name}")
+            first_future = executor.submit(_upload_one, container_client, first_file, first_size, remote_md5s)
+
+        if first_future.exception() is None:
+            _VERIFIED_CONTAINERS.add(container_name)
+
+        total_count += 1
+        pending[first_future] = (first_file, first_size)
+
+        for file_path, file_size in files:
+            total_count += 1
+            pending[executor.submit(_upload_one, container_client, file_path, file_size, remote_md5s)] = (file_path, file_size)
+
+            if len(pending) >= max_in_flight:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                _collect(done)
+
+        _collect(list(as_completed(pending)))
+
+    return uploaded_count, skipped_count, failed_count, total_count
+
+
+async def upload_files_async(account_url: str, credential, container_name: str, files,
+                             concurrency: int = 16, skip_unchanged: bool = False) -> tuple:
+    """
+    Upload files with the asyncio SDK on a single event loop.
+
+    Args:
+        account_url: Blob service account URL
+        credential: Synchronous token credential
+        container_name: Container name
+        files: Non-empty iterator of (file path, size in bytes) to upload
+        concurrency: Maximum number of files uploading at once
+        skip_unchanged: Skip files whose MD5 matches the existing blob's Content-MD5
+
+    Returns:
+        Tuple of (uploaded_count, skipped_count, failed_count, total_count)
+    """
+    uploaded_count = 0
+    skipped_count = 0
+    failed_count = 0
+    total_count = 0
+
+    # aiohttp's default connector caps all connections at 100 and drops idle
+    # connections after 15s, which forces fresh TLS handshakes between bursts
+    connector = aiohttp.TCPConnector(
+        limit=max(32, concurrency * PER_BLOB_CONCURRENCY),
+        keepalive_timeout=KEEPALIVE_TIMEOUT_SECONDS
+    )
+
+    async with aiohttp.ClientSession(connector=connector) as session, AsyncBlobServiceClient(
+        account_url=account_url,
+        credential=AsyncCredentialAdapter(credential),
+        transport=AioHttpTransport(session=session, session_owner=False)
+    ) as service_client:
+        container_client = service_client.get_container_client(container_name)
+        pending = {}
+
+        remote_md5s = None
+        if skip_unchanged:
+            try:
+                remote_md5s = await list_remote_md5s_async(container_client)
+            except ResourceNotFoundError:
+                remote_md5s = {}
+
+        def _collect(done):
+            nonlocal uploaded_count, skipped_count, failed_count
+            for task in done:
+                file_path, file_size = pending.pop(task)
+                if not _report_upload(file_path, file_size, task):
+                    failed_count += 1
+                elif task.result():
+                    uploaded_count += 1
+                else:
+                    skipped_count += 1
+                _report_progress(uploaded_count + skipped_count + failed_count)
+
+        # The first upload finishes before the rest start so a missing
+        # container can be created interactively
+        first_file, first_size = next(files)
+        first_task = asyncio.create_task(_upload_one_async(container_client, first_file, first_size, remote_md5s))
+        await asyncio.wait([first_task])
+
+        if container_name not in _VERIFIED_CONTAINERS and isinstance(first_task.exception(), ResourceNotFoundError):
+            confirm_create_container(container_name)
+            await container_client.create_container()
+            print(f"✓ Created container: {container_name}")
+            first_task = asyncio.create_task(_upload_one_async(container_client, first_file, first_size, remote_md5s))
+            await asyncio.wait([first_task])
+
+        if first_task.exception() is None:
+            _VERIFIED_CONTAINERS.add(container_name)
+
+        total_count += 1
+        pending[first_task] = (first_file, first_size)
+
+        for file_path, file_size in files:
+            total_count += 1
+            pending[asyncio.create_task(_upload_one_async(container_client, file_path, file_size, remote_md5s))] = (file_path, file_size)
+
+            if len(pending) >= concurrency:
+                done, _ = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                _collect(done)
+
+        if pending:
+            done, _ = await asyncio.wait(pending)
+            _collect(done)
+
+    return uploaded_count, skipped_count, failed_count, total_count
+
+
+def upload_files(storage_account: str, container_name: str, local_path: str, pattern: str = "*.json",
+                 workers: int = 16, sync: bool = False, skip_unchanged: bool = False):
     """
     Upload files to Azure Blob Storage.
 
@@ -36,6 +439,9 @@ def upload_files(storage_account: str, container_name: str, local_path: str, pat
         container_name: Container name
         local_path: Local directory or file path
         pattern: File pattern to match (default: *.json)
+        workers: Number of files to upload concurrently
+        sync: Use the thread-pool uploader instead of the asyncio one
+        skip_unchanged: Skip files whose content already matches the existing blob
     """
     print("=" * 60)
     print("Azure Blob Storage Upload")
@@ -51,88 +457,51 @@ def upload_files(storage_account: str, container_name: str, local_path: str, pat
     try:
         credential = AzureCliCredential()
         account_url = f"https://{storage_account}.blob.core.windows.net"
-
-        blob_service_client = BlobServiceClient(
-            account_url=account_url,
-            credential=credential
-        )
         print("✓ Authentication successful")
     except Exception as e:
         print(f"✗ Authentication failed: {str(e)}")
         print("\nPlease ensure you are logged in with 'az login'")
         sys.exit(1)
 
-    # Get container client
-    try:
-        container_client = blob_service_client.get_container_client(container_name)
-
-        # Check if container exists
-        if not container_client.exists():
-            print(f"\nWarning: Container '{container_name}' does not exist")
-            response = input("Create container? (y/n): ")
-            if response.lower() == 'y':
-                container_client.create_container()
-                print(f"✓ Created container: {container_name}")
-            else:
-                print("Upload cancelled")
-                sys.exit(0)
-
-    except Exception as e:
-        print(f"✗ Error accessing container: {str(e)}")
-        sys.exit(1)
-
     # Get files to upload
     local_path_obj = Path(local_path)
 
-    if local_path_obj.is_file():
-        # Single file
-        files_to_upload = [local_path_obj]
-    elif local_path_obj.is_dir():
-        # Directory - find matching files
-        files_to_upload = list(local_path_obj.glob(pattern))
-    else:
+    if not local_path_obj.exists():
         print(f"Error: Path does not exist: {local_path}")
         sys.exit(1)
 
-    if not files_to_upload:
+    # Files are discovered lazily, so uploads start before the directory walk finishes
+    files = iter_upload_files(local_path_obj, pattern)
+    first = next(files, None)
+
+    if first is None:
         print(f"No files found matching pattern: {pattern}")
         sys.exit(0)
 
-    print(f"\nFound {len(files_to_upload)} file(s) to upload")
+    print("\nUploading files...")
     print("-" * 60)
 
     # Upload files
-    uploaded_count = 0
-    failed_count = 0
-
-    for file_path in files_to_upload:
-        try:
-            blob_name = file_path.name
-            file_size = file_path.stat().st_size
-            file_size_mb = file_size / (1024 * 1024)
-
-            print(f"\nUploading: {blob_name} ({file_size_mb:.2f} MB)")
+    files = chain([first], files)
 
-            blob_client = container_client.get_blob_client(blob_name)
-
-            with open(file_path, "rb") as data:
-                blob_client.upload_blob(data, overwrite=True)
-
-            print(f"  ✓ Uploaded successfully")
-            uploaded_count += 1
-
-        except Exception as e:
-            print(f"  ✗ Upload failed: {str(e)}")
-            failed_count += 1
-            continue
+    if sync:
+        uploaded_count, skipped_count, failed_count, total_count = upload_files_threaded(
+            account_url, credential, container_name, files, workers, skip_unchanged
+        )
+    else:
+        uploaded_count, skipped_count, failed_count, total_count = asyncio.run(upload_files_async(
+            account_url, credential, container_name, files, workers, skip_unchanged
+        ))
 
     # Summary
     print("\n" + "=" * 60)
     print("Upload Summary")
     print("=" * 60)
     print(f"  Uploaded: {uploaded_count}")
+    if skip_unchanged:
+        print(f"  Skipped (unchanged): {skipped_count}")
     print(f"  Failed: {failed_count}")
-    print(f"  Total: {len(files_to_upload)}")
+    print(f"  Total: {total_count}")
     print()
 
     if failed_count > 0:
@@ -147,6 +516,14 @@ def upload_files(storage_account: str, container_name: str, local_path: str, pat
         print()
 
 
+def positive_int(value: str) -> int:
+    """argparse type for worker counts: an integer of at least 1."""
+    number = int(value)
+    if number < 1:
+        raise argparse.ArgumentTypeError(f"must be at least 1, got {value}")
+    return number
+
+
 def main():
     """Main function."""
     parser = argparse.ArgumentParser(
@@ -173,6 +550,25 @@ def main():
         help="File pattern to match (default: *.json)"
     )
 
+    parser.add_argument(
+        "--workers",
+        type=positive_int,
+        default=16,
+        help="Number of files to upload concurrently (default: 16)"
+    )
+
+    parser.add_argument(
+        "--sync",
+        action="store_true",
+        help="Use the thread-pool uploader instead of asyncio (for debugging)"
+    )
+
+    parser.add_argument(
+        "--skip-unchanged",
+        action="store_true",
+        help="Skip files whose MD5 matches the Content-MD5 of the existing blob"
+    )
+
     parser.add_argument(
         "--config",
         type=str,
@@ -199,7 +595,10 @@ def main():
         storage_account=storage_account,
         container_name=container_name,
         local_path=args.path,
-        pattern=args.pattern
+        pattern=args.pattern,
+        workers=args.workers,
+        sync=args.sync,
+        skip_unchanged=args.skip_unchanged
     )
 
 
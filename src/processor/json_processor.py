@@ -5,15 +5,93 @@ Processes e-commerce sales transaction JSON data with validation,
 aggregation, analytics, and anomaly detection.
 """
 
+import heapq
 import json
 import logging
+import sys
+import time
 from datetime import datetime
-from typing import Dict, List, Any, Tuple
+from typing import Dict, List, Any, Tuple, Union
 from collections import defaultdict
+from dataclasses import dataclass, field
+from operator import itemgetter
+
+try:
+    import orjson
+except ImportError:  # Optional: fall back to the stdlib parser
+    orjson = None
 
 
 logger = logging.getLogger(__name__)
 
+# datetime.fromisoformat() parses a trailing "Z" natively from Python 3.11
+_FROMISOFORMAT_ACCEPTS_Z = sys.version_info >= (3, 11)
+
+
+def parse_json(json_data: Union[str, bytes]) -> Any:
+    """
+    Parse a JSON document, using orjson when it is installed.
+
+    Args:
+        json_data: JSON text, or UTF-8 encoded JSON bytes
+
+    Returns:
+        Parsed document as plain Python objects
+
+    Raises:
+        json.JSONDecodeError: If the document is not valid JSON
+    """
+    if orjson is None:
+        return json.loads(json_data)
+
+    # orjson.JSONDecodeError subclasses json.JSONDecodeError, so callers need no changes
+    return orjson.loads(json_data)
+
+
+def dump_json(obj: Any) -> bytes:
+    """
+    Serialize a result document as indented UTF-8 JSON, using orjson when it is installed.
+
+    Non-string dict keys (e.g. a null payment method or a numeric category) are
+    converted to strings the same way json.dumps does.
+
+    Args:
+        obj: Document made of plain Python objects
+
+    Returns:
+        UTF-8 encoded JSON
+    """
+    if orjson is None:
+        return json.dumps(obj, indent=2, ensure_ascii=False).encode("utf-8")
+
+    return orjson.dumps(obj, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS)
+
+
+@dataclass
+class ProcessingState:
+    """Running aggregates and anomaly-detection state built up over one batch."""
+
+    # Aggregates
+    transaction_count: int = 0
+    completed_count: int = 0
+    total_revenue: float = 0.0
+    total_tax: float = 0.0
+    total_shipping: float = 0.0
+    category_revenue: Dict[str, float] = field(default_factory=lambda: defaultdict(float))
+    product_revenue: Dict[str, float] = field(default_factory=lambda: defaultdict(float))
+    product_quantity: Dict[str, int] = field(default_factory=lambda: defaultdict(int))
+    customer_revenue: Dict[str, float] = field(default_factory=lambda: defaultdict(float))
+    customer_order_count: Dict[str, int] = field(default_factory=lambda: defaultdict(int))
+    payment_methods: Dict[str, int] = field(default_factory=lambda: defaultdict(int))
+    shipping_methods: Dict[str, int] = field(default_factory=lambda: defaultdict(int))
+    status_counts: Dict[str, int] = field(default_factory=lambda: defaultdict(int))
+
+    # Anomaly detection
+    high_value_transactions: List[Dict[str, Any]] = field(default_factory=list)
+    suspicious_patterns: List[Dict[str, Any]] = field(default_factory=list)
+    seen_transaction_ids: set = field(default_factory=set)
+    customer_transactions: Dict[str, List[Dict[str, Any]]] = field(default_factory=lambda: defaultdict(list))
+
 
 class JSONProcessor:
     """Processes sales transaction JSON data."""
@@ -23,6 +101,14 @@ class JSONProcessor:
     MAX_QUANTITY = 100
     MAX_TOTAL = 100000.0
     ANOMALY_THRESHOLD = 5000.0  # Transactions above this are flagged
+    MAX_REPORTED_ERRORS = 50  # Invalid transactions listed in the result
+
+    # Required transaction fields, in the order missing-field errors are reported
+    REQUIRED_FIELDS = (
+        "transaction_id", "timestamp", "customer", "line_items",
+        "subtotal", "tax", "total", "payment_method", "status"
+    )
+    _REQUIRED_FIELD_SET = frozenset(REQUIRED_FIELDS)
 
     def __init__(self):
         """Initialize the processor."""
@@ -43,173 +129,272 @@ class JSONProcessor:
         Returns:
             Tuple of (is_valid, list_of_errors)
         """
-        errors = []
-
-        # Check required fields
-        required_fields = [
-            "transaction_id", "timestamp", "customer", "line_items",
-            "subtotal", "tax", "total", "payment_method", "status"
-        ]
-
-        for field in required_fields:
-            if field not in transaction:
-                errors.append(f"Missing required field: {field}")
+        # Check required fields with a single set comparison; build messages only on failure
+        if not transaction.keys() >= self._REQUIRED_FIELD_SET:
+            return False, [
+                f"Missing required field: {field}"
+                for field in self.REQUIRED_FIELDS
+                if field not in transaction
+            ]
 
-        if errors:
-            return False, errors
+        errors = []
+        add_error = errors.append
+        max_unit_price = self.MAX_UNIT_PRICE
+        max_quantity = self.MAX_QUANTITY
 
         # Validate customer
-        customer = transaction.get("customer", {})
+        customer = transaction["customer"]
         if not customer.get("customer_id"):
-            errors.append("Missing customer_id")
+            add_error("Missing customer_id")
         if not customer.get("email"):
-            errors.append("Missing customer email")
+            add_error("Missing customer email")
 
         # Validate line items
-        line_items = transaction.get("line_items", [])
+        line_items = transaction["line_items"]
         if not line_items:
-            errors.append("No line items in transaction")
+            add_error("No line items in transaction")
 
-        for idx, item in enumerate(line_items):
-            if item.get("unit_price", 0) > self.MAX_UNIT_PRICE:
-                errors.append(f"Line item {idx}: unit_price exceeds maximum")
-            if item.get("quantity", 0) > self.MAX_QUANTITY:
-                errors.append(f"Line item {idx}: quantity exceeds maximum")
-            if item.get("quantity", 0) <= 0:
-                errors.append(f"Line item {idx}: invalid quantity")
+        # One chained comparison per item; per-index messages only once an item fails
+        for item in line_items:
+            if not (0 < item.get("quantity", 0) <= max_quantity and item.get("unit_price", 0) <= max_unit_price):
+                errors.extend(self._line_item_errors(line_items))
+                break
 
         # Validate totals
-        total = transaction.get("total", 0)
+        total = transaction["total"]
         if total > self.MAX_TOTAL:
-            errors.append(f"Total amount exceeds maximum: {total}")
+            add_error(f"Total amount exceeds maximum: {total}")
         if total <= 0:
-            errors.append(f"Invalid total amount: {total}")
+            add_error(f"Invalid total amount: {total}")
 
         # Validate timestamp
+        timestamp = transaction["timestamp"]
         try:
-            datetime.fromisoformat(transaction["timestamp"].replace("Z", "+00:00"))
+            datetime.fromisoformat(timestamp if _FROMISOFORMAT_ACCEPTS_Z else timestamp.replace("Z", "+00:00"))
         except (ValueError, KeyError):
-            errors.append("Invalid timestamp format")
+            add_error("Invalid timestamp format")
 
-        is_valid = len(errors) == 0
-        return is_valid, errors
+        return not errors, errors
 
-    def calculate_aggregates(self, transactions: List[Dict[str, Any]]) -> Dict[str, Any]:
+    def _is_valid(self, transaction: Dict[str, Any]) -> bool:
         """
-        Calculate aggregate statistics from transactions.
+        Apply the validate_transaction rules as straight-line checks, without building error messages.
 
         Args:
-            transactions: List of transaction dictionaries
+            transaction: Transaction dictionary
 
         Returns:
-            Dictionary of aggregate statistics
+            True if validate_transaction would report no errors
         """
-        logger.info(f"Calculating aggregates for {len(transactions)} transactions")
+        if not transaction.keys() >= self._REQUIRED_FIELD_SET:
+            return False
 
-        total_revenue = 0.0
-        total_tax = 0.0
-        total_shipping = 0.0
-        transaction_count = 0
-        completed_count = 0
+        customer = transaction["customer"]
+        if not customer.get("customer_id") or not customer.get("email"):
+            return False
 
-        # Category and product tracking
-        category_revenue = defaultdict(float)
-        product_revenue = defaultdict(float)
-        product_quantity = defaultdict(int)
+        line_items = transaction["line_items"]
+        if not line_items:
+            return False
 
-        # Customer tracking
-        customer_revenue = defaultdict(float)
-        customer_order_count = defaultdict(int)
+        max_unit_price = self.MAX_UNIT_PRICE
+        max_quantity = self.MAX_QUANTITY
+        for item in line_items:
+            quantity = item.get("quantity", 0)
+            if item.get("unit_price", 0) > max_unit_price or quantity > max_quantity or quantity <= 0:
+                return False
 
-        # Payment and shipping methods
-        payment_methods = defaultdict(int)
-        shipping_methods = defaultdict(int)
+        total = transaction["total"]
+        if total > self.MAX_TOTAL or total <= 0:
+            return False
 
-        # Status tracking
-        status_counts = defaultdict(int)
+        timestamp = transaction["timestamp"]
+        try:
+            datetime.fromisoformat(timestamp if _FROMISOFORMAT_ACCEPTS_Z else timestamp.replace("Z", "+00:00"))
+        except (ValueError, KeyError):
+            return False
 
-        for transaction in transactions:
-            try:
-                # Skip invalid transactions
-                is_valid, _ = self.validate_transaction(transaction)
-                if not is_valid:
-                    continue
-
-                transaction_count += 1
-                status = transaction.get("status", "unknown")
-                status_counts[status] += 1
-
-                if status == "completed":
-                    completed_count += 1
-                    total = transaction.get("total", 0)
-                    total_revenue += total
-                    total_tax += transaction.get("tax", 0)
-                    total_shipping += transaction.get("shipping_cost", 0)
-
-                    # Customer stats
-                    customer_id = transaction.get("customer", {}).get("customer_id")
-                    if customer_id:
-                        customer_revenue[customer_id] += total
-                        customer_order_count[customer_id] += 1
-
-                    # Line item stats
-                    for item in transaction.get("line_items", []):
-                        category = item.get("category", "Unknown")
-                        product_name = item.get("product_name", "Unknown")
-                        subtotal = item.get("subtotal", 0)
-                        quantity = item.get("quantity", 0)
-
-                        category_revenue[category] += subtotal
-                        product_revenue[product_name] += subtotal
-                        product_quantity[product_name] += quantity
-
-                # Payment and shipping methods (all statuses)
-                payment_methods[transaction.get("payment_method", "Unknown")] += 1
-                shipping_methods[transaction.get("shipping_method", "Unknown")] += 1
-
-            except Exception as e:
-                logger.error(f"Error processing transaction: {str(e)}")
-                continue
+        return True
+
+    def _line_item_errors(self, line_items: List[Dict[str, Any]]) -> List[str]:
+        """
+        Describe every out-of-range line item.
+
+        Args:
+            line_items: Line item dictionaries of one transaction
+
+        Returns:
+            List of errors, in line item order
+        """
+        errors = []
+
+        for idx, item in enumerate(line_items):
+            quantity = item.get("quantity", 0)
+            if item.get("unit_price", 0) > self.MAX_UNIT_PRICE:
+                errors.append(f"Line item {idx}: unit_price exceeds maximum")
+            if quantity > self.MAX_QUANTITY:
+                errors.append(f"Line item {idx}: quantity exceeds maximum")
+            if quantity <= 0:
+                errors.append(f"Line item {idx}: invalid quantity")
+
+        return errors
+
+    def _update_aggregates(self, transaction: Dict[str, Any], state: ProcessingState):
+        """
+        Fold one valid transaction into the aggregate statistics.
+
+        The transaction must already have passed validate_transaction, so its
+        required fields are read directly and not re-checked.
+
+        Args:
+            transaction: Transaction dictionary
+            state: Accumulated processing state
+        """
+        try:
+            state.transaction_count += 1
+            status = transaction["status"]
+            state.status_counts[status] += 1
+
+            if status == "completed":
+                state.completed_count += 1
+                total = transaction["total"]
+                state.total_revenue += total
+                state.total_tax += transaction["tax"]
+                state.total_shipping += transaction.get("shipping_cost", 0)
+
+                # Customer stats
+                customer_id = transaction["customer"]["customer_id"]
+                state.customer_revenue[customer_id] += total
+                state.customer_order_count[customer_id] += 1
+
+                # Line item stats; the accumulators are bound once per transaction, not per item
+                category_revenue = state.category_revenue
+                product_revenue = state.product_revenue
+                product_quantity = state.product_quantity
+
+                for item in transaction["line_items"]:
+                    product_name = item.get("product_name", "Unknown")
+                    subtotal = item.get("subtotal", 0)
+
+                    category_revenue[item.get("category", "Unknown")] += subtotal
+                    product_revenue[product_name] += subtotal
+                    product_quantity[product_name] += item.get("quantity", 0)
+
+            # Payment and shipping methods (all statuses)
+            state.payment_methods[transaction["payment_method"]] += 1
+            state.shipping_methods[transaction.get("shipping_method", "Unknown")] += 1
+
+        except Exception as e:
+            logger.error(f"Error processing transaction: {str(e)}")
+
+    def _update_anomalies(self, transaction: Dict[str, Any], state: ProcessingState):
+        """
+        Scan one valid transaction for anomalies.
+
+        The transaction must already have passed validate_transaction.
+
+        Args:
+            transaction: Transaction dictionary
+            state: Accumulated processing state
+        """
+        try:
+            transaction_id = transaction["transaction_id"]
+            total = transaction["total"]
+            timestamp = transaction["timestamp"]
+            customer_id = transaction["customer"]["customer_id"]
+
+            # Check for high-value transactions
+            if total > self.ANOMALY_THRESHOLD:
+                state.high_value_transactions.append({
+                    "transaction_id": transaction_id,
+                    "total": total,
+                    "timestamp": timestamp,
+                    "customer_id": customer_id
+                })
+
+            # Check for duplicate transaction IDs (an ID already in the set is not re-added)
+            seen_transaction_ids = state.seen_transaction_ids
+            if transaction_id in seen_transaction_ids:
+                state.suspicious_patterns.append({
+                    "type": "duplicate_transaction_id",
+                    "transaction_id": transaction_id,
+                    "description": "Transaction ID appears multiple times"
+                })
+            else:
+                seen_transaction_ids.add(transaction_id)
+
+            # Track transactions by customer for rapid transaction detection
+            state.customer_transactions[customer_id].append({
+                "transaction_id": transaction_id,
+                "timestamp": timestamp,
+                "total": total
+            })
+
+            # Check for unusual quantity patterns
+            for item in transaction["line_items"]:
+                if item.get("quantity", 0) > 20:
+                    state.suspicious_patterns.append({
+                        "type": "high_quantity",
+                        "transaction_id": transaction_id,
+                        "product": item.get("product_name"),
+                        "quantity": item.get("quantity"),
+                        "description": f"Unusually high quantity: {item.get('quantity')}"
+                    })
+
+        except Exception as e:
+            logger.error(f"Error detecting anomalies: {str(e)}")
+
+    def _process_one(self, transaction: Dict[str, Any], state: ProcessingState) -> bool:
+        """
+        Validate one transaction and, if valid, fold it into the aggregates and anomaly scan.
+
+        Error messages are not built here; callers that report them use validate_transaction.
+
+        Args:
+            transaction: Transaction dictionary
+            state: Accumulated processing state
+
+        Returns:
+            True if the transaction is valid
+        """
+        if not self._is_valid(transaction):
+            return False
+
+        self._update_aggregates(transaction, state)
+        self._update_anomalies(transaction, state)
+
+        return True
+
+    def _build_aggregates(self, state: ProcessingState) -> Dict[str, Any]:
+        """Build the aggregate statistics result from the accumulated state."""
+        completed_count = state.completed_count
+        customer_order_count = state.customer_order_count
+        product_revenue = state.product_revenue
+        product_quantity = state.product_quantity
 
         # Calculate averages
-        avg_order_value = total_revenue / completed_count if completed_count > 0 else 0
-        avg_tax = total_tax / completed_count if completed_count > 0 else 0
-        avg_shipping = total_shipping / completed_count if completed_count > 0 else 0
-
-        # Top customers (by revenue)
-        top_customers = sorted(
-            customer_revenue.items(),
-            key=lambda x: x[1],
-            reverse=True
-        )[:10]
-
-        # Top products (by revenue)
-        top_products_revenue = sorted(
-            product_revenue.items(),
-            key=lambda x: x[1],
-            reverse=True
-        )[:10]
-
-        # Top products (by quantity)
-        top_products_quantity = sorted(
-            product_quantity.items(),
-            key=lambda x: x[1],
-            reverse=True
-        )[:10]
+        avg_order_value = state.total_revenue / completed_count if completed_count > 0 else 0
+        avg_tax = state.total_tax / completed_count if completed_count > 0 else 0
+        avg_shipping = state.total_shipping / completed_count if completed_count > 0 else 0
+
+        # Top 10s use a bounded heap instead of sorting every customer/product
+        top_customers = heapq.nlargest(10, state.customer_revenue.items(), key=itemgetter(1))
+        top_products_revenue = heapq.nlargest(10, product_revenue.items(), key=itemgetter(1))
+        top_products_quantity = heapq.nlargest(10, product_quantity.items(), key=itemgetter(1))
 
         return {
             "summary": {
-                "total_transactions": transaction_count,
+                "total_transactions": state.transaction_count,
                 "completed_transactions": completed_count,
-                "total_revenue": round(total_revenue, 2),
-                "total_tax": round(total_tax, 2),
-                "total_shipping": round(total_shipping, 2),
+                "total_revenue": round(state.total_revenue, 2),
+                "total_tax": round(state.total_tax, 2),
+                "total_shipping": round(state.total_shipping, 2),
                 "average_order_value": round(avg_order_value, 2),
                 "average_tax": round(avg_tax, 2),
                 "average_shipping": round(avg_shipping, 2)
             },
-            "status_breakdown": dict(status_counts),
-            "revenue_by_category": {k: round(v, 2) for k, v in sorted(category_revenue.items(), key=lambda x: x[1], reverse=True)},
+            "status_breakdown": dict(state.status_counts),
+            "revenue_by_category": {k: round(v, 2) for k, v in sorted(state.category_revenue.items(), key=lambda x: x[1], reverse=True)},
             "top_customers": [
                 {"customer_id": cid, "total_revenue": round(rev, 2), "order_count": customer_order_count[cid]}
                 for cid, rev in top_customers
@@ -222,75 +407,12 @@ class JSONProcessor:
                 {"product": prod, "quantity_sold": qty, "revenue": round(product_revenue[prod], 2)}
                 for prod, qty in top_products_quantity
             ],
-            "payment_methods": dict(payment_methods),
-            "shipping_methods": dict(shipping_methods)
+            "payment_methods": dict(state.payment_methods),
+            "shipping_methods": dict(state.shipping_methods)
         }
 
-    def detect_anomalies(self, transactions: List[Dict[str, Any]]) -> Dict[str, Any]:
-        """
-        Detect anomalies in transactions.
-
-        Args:
-            transactions: List of transaction dictionaries
-
-        Returns:
-            Dictionary of anomaly detection results
-        """
-        logger.info("Detecting anomalies in transactions")
-
-        high_value_transactions = []
-        suspicious_patterns = []
-        duplicate_check = set()
-        rapid_transactions = defaultdict(list)
-
-        for transaction in transactions:
-            try:
-                transaction_id = transaction.get("transaction_id")
-                total = transaction.get("total", 0)
-                timestamp = transaction.get("timestamp", "")
-                customer_id = transaction.get("customer", {}).get("customer_id")
-
-                # Check for high-value transactions
-                if total > self.ANOMALY_THRESHOLD:
-                    high_value_transactions.append({
-                        "transaction_id": transaction_id,
-                        "total": total,
-                        "timestamp": timestamp,
-                        "customer_id": customer_id
-                    })
-
-                # Check for duplicate transaction IDs
-                if transaction_id in duplicate_check:
-                    suspicious_patterns.append({
-                        "type": "duplicate_transaction_id",
-                        "transaction_id": transaction_id,
-                        "description": "Transaction ID appears multiple times"
-                    })
-                duplicate_check.add(transaction_id)
-
-                # Track transactions by customer for rapid transaction detection
-                if customer_id:
-                    rapid_transactions[customer_id].append({
-                        "transaction_id": transaction_id,
-                        "timestamp": timestamp,
-                        "total": total
-                    })
-
-                # Check for unusual quantity patterns
-                for item in transaction.get("line_items", []):
-                    if item.get("quantity", 0) > 20:
-                        suspicious_patterns.append({
-                            "type": "high_quantity",
-                            "transaction_id": transaction_id,
-                            "product": item.get("product_name"),
-                            "quantity": item.get("quantity"),
-                            "description": f"Unusually high quantity: {item.get('quantity')}"
-                        })
-
-            except Exception as e:
-                logger.error(f"Error detecting anomalies: {str(e)}")
-                continue
-
+    def _build_anomalies(self, state: ProcessingState) -> Dict[str, Any]:
+        """Build the anomaly detection result from the accumulated state."""
         # Check for customers with many transactions (possible fraud)
         frequent_customers = [
             {
@@ -298,19 +420,19 @@ class JSONProcessor:
                 "transaction_count": len(txns),
                 "total_spent": sum(t["total"] for t in txns)
             }
-            for cid, txns in rapid_transactions.items()
+            for cid, txns in state.customer_transactions.items()
             if len(txns) > 10
         ]
 
         return {
             "high_value_transactions": {
-                "count": len(high_value_transactions),
+                "count": len(state.high_value_transactions),
                 "threshold": self.ANOMALY_THRESHOLD,
-                "transactions": high_value_transactions[:20]  # Limit to top 20
+                "transactions": state.high_value_transactions[:20]  # Limit to top 20
             },
             "suspicious_patterns": {
-                "count": len(suspicious_patterns),
-                "patterns": suspicious_patterns[:20]  # Limit to top 20
+                "count": len(state.suspicious_patterns),
+                "patterns": state.suspicious_patterns[:20]  # Limit to top 20
             },
             "frequent_customers": {
                 "count": len(frequent_customers),
@@ -318,23 +440,60 @@ class JSONProcessor:
             }
         }
 
-    def process(self, json_data: str) -> Dict[str, Any]:
+    def calculate_aggregates(self, transactions: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """
+        Calculate aggregate statistics from transactions.
+
+        Args:
+            transactions: List of transaction dictionaries that already passed validate_transaction
+
+        Returns:
+            Dictionary of aggregate statistics
+        """
+        logger.info(f"Calculating aggregates for {len(transactions)} transactions")
+
+        state = ProcessingState()
+        for transaction in transactions:
+            self._update_aggregates(transaction, state)
+
+        return self._build_aggregates(state)
+
+    def detect_anomalies(self, transactions: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """
+        Detect anomalies in transactions.
+
+        Args:
+            transactions: List of transaction dictionaries that already passed validate_transaction
+
+        Returns:
+            Dictionary of anomaly detection results
+        """
+        logger.info("Detecting anomalies in transactions")
+
+        state = ProcessingState()
+        for transaction in transactions:
+            self._update_anomalies(transaction, state)
+
+        return self._build_anomalies(state)
+
+    def process(self, json_data: Union[str, bytes]) -> Dict[str, Any]:
         """
         Main processing function.
 
         Args:
-            json_data: JSON string containing batch data
+            json_data: JSON string, or UTF-8 encoded JSON bytes, containing batch data
 
         Returns:
             Dictionary with processing results
         """
         logger.info("Starting JSON processing")
-        start_time = datetime.now()
+        start_time = time.perf_counter()
 
         try:
             # Parse JSON
-            data = json.loads(json_data)
-            logger.info(f"Parsed JSON data: {len(json_data)} characters")
+            data = parse_json(json_data)
+            unit = "bytes" if isinstance(json_data, bytes) else "characters"
+            logger.info(f"Parsed JSON data: {len(json_data)} {unit}")
 
             # Extract transactions
             transactions = data.get("transactions", [])
@@ -343,35 +502,37 @@ class JSONProcessor:
 
             logger.info(f"Processing batch {batch_id} with {transaction_count} transactions")
 
-            # Validate all transactions
+            # Validate, aggregate and scan for anomalies in a single pass
             validation_results = []
-            valid_transactions = []
+            state = ProcessingState()
 
-            for idx, transaction in enumerate(transactions):
-                is_valid, errors = self.validate_transaction(transaction)
+            # Keep the per-row loop lean: bound method and a local counter instead of stats dict updates
+            process_one = self._process_one
+            valid_count = 0
 
-                if is_valid:
-                    self.stats["valid_transactions"] += 1
-                    valid_transactions.append(transaction)
-                else:
-                    self.stats["invalid_transactions"] += 1
+            for idx, transaction in enumerate(transactions):
+                if process_one(transaction, state):
+                    valid_count += 1
+                # Only the reported invalid transactions pay for formatting error messages
+                elif len(validation_results) < self.MAX_REPORTED_ERRORS:
+                    _, errors = self.validate_transaction(transaction)
                     validation_results.append({
                         "transaction_index": idx,
                         "transaction_id": transaction.get("transaction_id", "unknown"),
                         "errors": errors
                     })
 
+            self.stats["valid_transactions"] += valid_count
+            self.stats["invalid_transactions"] += transaction_count - valid_count
             self.stats["total_transactions"] = transaction_count
 
-            # Calculate aggregates
-            aggregates = self.calculate_aggregates(valid_transactions)
-
-            # Detect anomalies
-            anomalies = self.detect_anomalies(valid_transactions)
+            aggregates = self._build_aggregates(state)
+            anomalies = self._build_anomalies(state)
 
             # Calculate processing time
+            # Monotonic clock for the duration; the wall clock is read once for the timestamp
+            processing_time = time.perf_counter() - start_time
             end_time = datetime.now()
-            processing_time = (end_time - start_time).total_seconds()
 
             # Build result
             result = {
@@ -383,7 +544,7 @@ class JSONProcessor:
                     "total_transactions": self.stats["total_transactions"],
                     "valid_transactions": self.stats["valid_transactions"],
                     "invalid_transactions": self.stats["invalid_transactions"],
-                    "validation_errors": validation_results[:50]  # Limit to first 50
+                    "validation_errors": validation_results
                 },
                 "analytics": aggregates,
                 "anomalies": anomalies,
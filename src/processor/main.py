@@ -16,7 +16,7 @@ from pathlib import Path
 
 # Import our modules
 from storage_helper import StorageHelper
-from json_processor import JSONProcessor
+from json_processor import JSONProcessor, dump_json
 
 
 # Configure logging
@@ -100,50 +100,17 @@ def main():
             managed_identity_client_id=managed_identity_client_id,
         )
 
-        # Create working directory - try multiple locations
-        work_dirs_to_try = ["/app/temp", "/tmp/batch_work", "/app"]
-        work_dir = None
-        
-        for dir_path in work_dirs_to_try:
-            try:
-                work_dir = Path(dir_path)
-                work_dir.mkdir(parents=True, exist_ok=True)
-                
-                # Test write permissions
-                test_file = work_dir / "test_write.tmp"
-                test_file.write_text("test")
-                test_file.unlink()
-                
-                logger.info(f"Working directory: {work_dir}")
-                break
-            except Exception as e:
-                logger.warning(f"Cannot use {dir_path}: {e}")
-                continue
-        
-        if work_dir is None:
-            raise Exception("No writable directory found")
-
-        # Download input file
+        # Download input blob straight into memory; no local temp file is needed
         logger.info(f"Downloading input file: {input_blob_name}")
-        input_file_path = work_dir / "input.json"
-
-        download_success = storage_helper.download_blob_to_file(
+        json_content = storage_helper.download_blob_to_bytes(
             container_name=input_container,
-            blob_name=input_blob_name,
-            local_path=str(input_file_path)
+            blob_name=input_blob_name
         )
 
-        if not download_success:
+        if json_content is None:
             raise Exception("Failed to download input file from storage")
 
-        logger.info(f"Successfully downloaded input file to {input_file_path}")
-
-        # Read JSON content
-        logger.info("Reading JSON content...")
-        with open(input_file_path, 'r', encoding='utf-8') as f:
-            json_content = f.read()
-
-        logger.info(f"Read {len(json_content)} characters from input file")
+        logger.info(f"Successfully downloaded {len(json_content)} bytes from {input_blob_name}")
 
         # Process JSON
         logger.info("Processing JSON data...")
@@ -167,19 +134,14 @@ def main():
         timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
         output_blob_name = f"processed_{input_name}_{timestamp}.json"
 
-        # Save result locally
-        output_file_path = work_dir / "output.json"
-        logger.info(f"Saving result to {output_file_path}")
-
-        with open(output_file_path, 'w', encoding='utf-8') as f:
-            json.dump(result, f, indent=2, ensure_ascii=False)
+        # Serialize the result in memory and upload it directly
+        output_bytes = dump_json(result)
 
-        # Upload result to output container
         logger.info(f"Uploading result to blob: {output_blob_name}")
-        upload_success = storage_helper.upload_blob_from_file(
+        upload_success = storage_helper.upload_blob_from_bytes(
             container_name=output_container,
             blob_name=output_blob_name,
-            local_path=str(output_file_path),
+            data=output_bytes,
             overwrite=True
         )
 
@@ -5,24 +5,227 @@ Handles all blob storage operations using Azure Managed Identity.
 """
 
 import os
+import mmap
+import base64
+import asyncio
 import logging
-from typing import Optional
+import threading
+from collections import OrderedDict
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, as_completed, wait
+from contextlib import contextmanager
+from functools import lru_cache
+from itertools import islice
+from typing import Callable, Iterable, Iterator, List, Optional, Tuple
+import requests
+from azure.core.credentials import TokenCredential
 from azure.identity import DefaultAzureCredential, ManagedIdentityCredential
-from azure.storage.blob import BlobServiceClient, BlobClient, ContainerClient
-from azure.core.exceptions import HttpResponseError
+from azure.identity.aio import (
+    DefaultAzureCredential as AsyncDefaultAzureCredential,
+    ManagedIdentityCredential as AsyncManagedIdentityCredential,
+)
+from azure.storage.blob import BlobBlock, BlobServiceClient, BlobClient, ContainerClient, ExponentialRetry
+from azure.storage.blob.aio import BlobServiceClient as AsyncBlobServiceClient
+from azure.core.exceptions import HttpResponseError, ResourceNotFoundError
+from azure.core.pipeline.transport import RequestsTransport
 
 
 logger = logging.getLogger(__name__)
 
 
+def _env_int(name: str, default: int) -> int:
+    """Read an integer tuning knob from the environment, falling back to a default."""
+    value = os.environ.get(name)
+    return int(value) if value else default
+
+
+# Transfer tuning: blobs above the single-request size are moved as parallel ranged GETs / staged blocks.
+# Uploads up to MAX_SINGLE_PUT_SIZE with a known length go out as one Put Blob, with no block-list commit.
+MAX_CONCURRENCY = _env_int("STORAGE_MAX_CONCURRENCY", 8)
+MAX_SINGLE_GET_SIZE = _env_int("STORAGE_MAX_SINGLE_GET_SIZE", 64 * 1024 * 1024)
+MAX_CHUNK_GET_SIZE = _env_int("STORAGE_MAX_CHUNK_GET_SIZE", 16 * 1024 * 1024)
+MAX_SINGLE_PUT_SIZE = _env_int("STORAGE_MAX_SINGLE_PUT_SIZE", 64 * 1024 * 1024)
+MAX_BLOCK_SIZE = _env_int("STORAGE_MAX_BLOCK_SIZE", 16 * 1024 * 1024)
+
+# Files at least this large are uploaded from a memory map rather than the buffered file object
+MMAP_THRESHOLD = 64 * 1024 * 1024
+
+# Blocks staged in parallel by upload_large_file
+LARGE_UPLOAD_CONCURRENCY = _env_int("STORAGE_LARGE_UPLOAD_CONCURRENCY", 16)
+
+# Blob names returned per List Blobs request (the service maximum)
+LIST_PAGE_SIZE = 5000
+
+# Sub-requests the Blob Batch API accepts in one HTTP call
+BLOB_BATCH_MAX_SIZE = 256
+
+# Connection handling: pooled keep-alive connections, bounded timeouts and patient retries
+CONNECTION_POOL_SIZE = _env_int("STORAGE_CONNECTION_POOL_SIZE", 64)
+CONNECTION_TIMEOUT_SECONDS = 20
+READ_TIMEOUT_SECONDS = 120
+RETRY_TOTAL = 6  # Waits ~1s, 3s, 5s, 9s, 17s, 33s (plus jitter) between attempts
+
+# Blobs transferred at once by AsyncStorageHelper bulk operations
+MAX_PARALLEL_BLOBS = _env_int("STORAGE_MAX_PARALLEL_BLOBS", 32)
+
+# Worker threads used by StorageHelper.download_prefix / upload_directory
+BULK_MAX_WORKERS = _env_int("STORAGE_BULK_MAX_WORKERS", 16)
+
+# Bulk helpers log per-blob success at DEBUG and one INFO progress line per this many blobs
+BULK_LOG_INTERVAL = 1000
+
+# Total bytes of blob content kept for ETag-revalidated in-memory reads (0 disables the cache)
+BLOB_CACHE_MAX_BYTES = _env_int("STORAGE_BLOB_CACHE_MAX_BYTES", 0)
+
+
+@contextmanager
+def _open_for_upload(local_path: str, file_size: int):
+    """Open a file for uploading, memory-mapping it when it is large."""
+    with open(local_path, "rb") as data:
+        if file_size < MMAP_THRESHOLD:
+            yield data
+        else:
+            # The SDK reads blocks straight from the page cache instead of through the file buffer
+            with mmap.mmap(data.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                yield mapped
+
+
+def _ensure_parent_dir(local_path: str, created_dirs: set) -> None:
+    """Create local_path's directory unless this helper already created (or found) it."""
+    directory = os.path.dirname(local_path) or '.'
+    if directory not in created_dirs:
+        # exist_ok makes a racing duplicate call harmless; set.add is atomic under the GIL
+        os.makedirs(directory, exist_ok=True)
+        created_dirs.add(directory)
+
+
+def _retry_policy() -> ExponentialRetry:
+    """Exponential backoff for throttling (503), server errors and dropped connections."""
+    return ExponentialRetry(initial_backoff=1, increment_base=2, retry_total=RETRY_TOTAL)
+
+
+@lru_cache(maxsize=None)
+def _get_blob_service_client(
+    account_url: str,
+    use_managed_identity: bool,
+    managed_identity_client_id: Optional[str],
+) -> Tuple[TokenCredential, BlobServiceClient]:
+    """
+    Create (once per account and identity) the credential and BlobServiceClient.
+
+    Reusing them keeps the credential's token cache and the client's connection
+    pool warm across StorageHelper instances in the same process.
+
+    Args:
+        account_url: Blob service endpoint of the storage account
+        use_managed_identity: If True, use Managed Identity. If False, use DefaultAzureCredential
+        managed_identity_client_id: Optional client ID for a user-assigned managed identity
+
+    Returns:
+        Tuple of (credential, blob_service_client)
+    """
+    # Set up authentication - prefer explicit user-assigned MI when provided
+    if use_managed_identity:
+        if managed_identity_client_id:
+            credential = ManagedIdentityCredential(client_id=managed_identity_client_id)
+            logger.info(
+                "Using User-Assigned Managed Identity (client_id=%s) for authentication",
+                managed_identity_client_id,
+            )
+        else:
+            credential = ManagedIdentityCredential()
+            logger.info("Using System-Assigned (or default) Managed Identity for authentication")
+    else:
+        # Use DefaultAzureCredential (tries multiple methods)
+        credential = DefaultAzureCredential()
+        logger.info("Using DefaultAzureCredential for authentication")
+
+    # One pooled session per client, sized for parallel chunk transfers from several threads
+    session = requests.Session()
+    session.mount("https://", requests.adapters.HTTPAdapter(pool_maxsize=CONNECTION_POOL_SIZE))
+
+    blob_service_client = BlobServiceClient(
+        account_url=account_url,
+        credential=credential,
+        transport=RequestsTransport(
+            session=session,
+            session_owner=False,
+            connection_timeout=CONNECTION_TIMEOUT_SECONDS,
+            read_timeout=READ_TIMEOUT_SECONDS,
+        ),
+        retry_policy=_retry_policy(),
+        max_single_get_size=MAX_SINGLE_GET_SIZE,
+        max_chunk_get_size=MAX_CHUNK_GET_SIZE,
+        max_single_put_size=MAX_SINGLE_PUT_SIZE,
+        max_block_size=MAX_BLOCK_SIZE,
+    )
+
+    return credential, blob_service_client
+
+
+class _BlobContentCache:
+    """Thread-safe LRU of (container, blob) -> (etag, content), capped by total content bytes."""
+
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        self._entries: "OrderedDict[Tuple[str, str], Tuple[str, bytes]]" = OrderedDict()
+        self._size = 0
+        self._lock = threading.Lock()
+
+    def get(self, key: Tuple[str, str]) -> Optional[Tuple[str, bytes]]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+            return entry
+
+    def put(self, key: Tuple[str, str], etag: str, content: bytes) -> None:
+        with self._lock:
+            self._discard(key)
+            if len(content) > self.max_bytes:
+                return
+            self._entries[key] = (etag, content)
+            self._size += len(content)
+            while self._size > self.max_bytes:
+                _, (_, evicted) = self._entries.popitem(last=False)
+                self._size -= len(evicted)
+
+    def discard(self, key: Tuple[str, str]) -> None:
+        with self._lock:
+            self._discard(key)
+
+    def _discard(self, key: Tuple[str, str]) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self._size -= len(entry[1])
+
+
+@lru_cache(maxsize=4096)
+def _get_blob_client(blob_service_client: BlobServiceClient, container_name: str, blob_name: str) -> BlobClient:
+    """Build (once per service client, container and blob) a thread-safe BlobClient."""
+    return blob_service_client.get_blob_client(container=container_name, blob=blob_name)
+
+
+@lru_cache(maxsize=256)
+def _get_container_client(blob_service_client: BlobServiceClient, container_name: str) -> ContainerClient:
+    """Build (once per service client and container) a thread-safe ContainerClient."""
+    return blob_service_client.get_container_client(container_name)
+
+
 class StorageHelper:
-    """Helper class for Azure Blob Storage operations with Managed Identity."""
+    """
+    Helper class for Azure Blob Storage operations with Managed Identity.
+
+    Instances for the same account and identity share one credential and
+    BlobServiceClient, so constructing a helper per operation stays cheap.
+    """
 
     def __init__(
         self,
         storage_account_name: str,
         use_managed_identity: bool = True,
         managed_identity_client_id: Optional[str] = None,
+        max_concurrency: int = MAX_CONCURRENCY,
+        cache_max_bytes: int = BLOB_CACHE_MAX_BYTES,
     ):
         """
         Initialize Storage Helper.
@@ -31,33 +234,31 @@ class StorageHelper:
             storage_account_name: Name of the Azure Storage account
             use_managed_identity: If True, use Managed Identity. If False, use DefaultAzureCredential
             managed_identity_client_id: Optional client ID for a user-assigned managed identity
+            max_concurrency: Parallel connections per blob download/upload (env: STORAGE_MAX_CONCURRENCY)
+            cache_max_bytes: Byte budget for caching in-memory downloads, revalidated by ETag on
+                each read (env: STORAGE_BLOB_CACHE_MAX_BYTES; 0 disables the cache)
         """
         self.storage_account_name = storage_account_name
+        self.max_concurrency = max_concurrency
+        self._content_cache = _BlobContentCache(cache_max_bytes) if cache_max_bytes > 0 else None
+        self._created_dirs = set()
         self.account_url = f"https://{storage_account_name}.blob.core.windows.net"
 
-        # Set up authentication - prefer explicit user-assigned MI when provided
-        if use_managed_identity:
-            if managed_identity_client_id:
-                self.credential = ManagedIdentityCredential(client_id=managed_identity_client_id)
-                logger.info(
-                    "Using User-Assigned Managed Identity (client_id=%s) for authentication",
-                    managed_identity_client_id,
-                )
-            else:
-                self.credential = ManagedIdentityCredential()
-                logger.info("Using System-Assigned (or default) Managed Identity for authentication")
-        else:
-            # Use DefaultAzureCredential (tries multiple methods)
-            self.credential = DefaultAzureCredential()
-            logger.info("Using DefaultAzureCredential for authentication")
-
-        # Initialize BlobServiceClient
-        self.blob_service_client = BlobServiceClient(
-            account_url=self.account_url,
-            credential=self.credential
+        self.credential, self.blob_service_client = _get_blob_service_client(
+            self.account_url,
+            use_managed_identity,
+            managed_identity_client_id or None,
         )
 
-        logger.info(f"Initialized StorageHelper for account: {storage_account_name}")
+        logger.info("Initialized StorageHelper for account: %s", storage_account_name)
+
+    def _blob_client(self, container_name: str, blob_name: str) -> BlobClient:
+        """Return the cached BlobClient for a blob, skipping URL assembly on repeat calls."""
+        return _get_blob_client(self.blob_service_client, container_name, blob_name)
+
+    def _container_client(self, container_name: str) -> ContainerClient:
+        """Return the cached ContainerClient for a container."""
+        return _get_container_client(self.blob_service_client, container_name)
 
     def download_blob_to_file(self, container_name: str, blob_name: str, local_path: str) -> bool:
         """
@@ -72,24 +273,20 @@ class StorageHelper:
             True if successful, False otherwise
         """
         try:
-            logger.info(f"Downloading blob: {blob_name} from container: {container_name}")
+            logger.debug("Downloading blob: %s from container: %s", blob_name, container_name)
 
             # Get blob client
-            blob_client = self.blob_service_client.get_blob_client(
-                container=container_name,
-                blob=blob_name
-            )
+            blob_client = self._blob_client(container_name, blob_name)
 
             # Create directory if it doesn't exist
-            os.makedirs(os.path.dirname(local_path) or '.', exist_ok=True)
+            _ensure_parent_dir(local_path, self._created_dirs)
 
-            # Download blob
+            # Stream the blob straight into the file instead of buffering it in memory first
             with open(local_path, "wb") as file:
-                download_stream = blob_client.download_blob()
-                file.write(download_stream.readall())
+                download_stream = blob_client.download_blob(max_concurrency=self.max_concurrency)
+                file_size = download_stream.readinto(file)
 
-            file_size = os.path.getsize(local_path)
-            logger.info(f"Successfully downloaded {blob_name} ({file_size} bytes) to {local_path}")
+            logger.debug("Successfully downloaded %s (%s bytes) to %s", blob_name, file_size, local_path)
             return True
 
         except HttpResponseError as e:
@@ -100,16 +297,65 @@ class StorageHelper:
                     container_name,
                     self.storage_account_name,
                 )
-            logger.error(f"HTTP error downloading blob {blob_name}: {e.message}")
+            logger.error("HTTP error downloading blob %s: %s", blob_name, e.message)
             return False
         except Exception as e:
-            logger.error(f"Unexpected error downloading blob {blob_name}: {str(e)}", exc_info=True)
+            logger.error("Unexpected error downloading blob %s: %s", blob_name, e, exc_info=True)
             return False
 
+    def try_download_blob_to_file(self, container_name: str, blob_name: str, local_path: str) -> Optional[int]:
+        """
+        Download a blob to a local file if it exists, in a single round-trip.
+
+        Prefer this over blob_exists() followed by download_blob_to_file(): a missing
+        blob is detected from the download request itself, and no local file is created.
+
+        Args:
+            container_name: Name of the container
+            blob_name: Name of the blob
+            local_path: Local file path to save to
+
+        Returns:
+            Number of bytes written, or None if the blob does not exist or the download failed
+        """
+        try:
+            blob_client = self._blob_client(container_name, blob_name)
+
+            try:
+                download_stream = blob_client.download_blob(max_concurrency=self.max_concurrency)
+            except ResourceNotFoundError:
+                logger.info("Blob %s not found in container %s; nothing downloaded", blob_name, container_name)
+                return None
+
+            _ensure_parent_dir(local_path, self._created_dirs)
+
+            with open(local_path, "wb") as file:
+                size = download_stream.readinto(file)
+
+            logger.debug("Successfully downloaded %s (%s bytes) to %s", blob_name, size, local_path)
+            return size
+
+        except HttpResponseError as e:
+            if getattr(e, 'error_code', '') == 'AuthorizationFailure':
+                logger.error(
+                    "Authorization failure downloading blob %s from container %s. Ensure managed identity has 'Storage Blob Data Reader' or 'Storage Blob Data Contributor' on storage account %s.",
+                    blob_name,
+                    container_name,
+                    self.storage_account_name,
+                )
+            logger.error("HTTP error downloading blob %s: %s", blob_name, e.message)
+            return None
+        except Exception as e:
+            logger.error("Unexpected error downloading blob %s: %s", blob_name, e, exc_info=True)
+            return None
+
     def download_blob_to_string(self, container_name: str, blob_name: str) -> Optional[str]:
         """
         Download a blob as a string.
 
+        Callers that feed the content to a JSON parser should use download_blob_to_bytes()
+        instead; both json.loads and orjson parse UTF-8 bytes without this extra decode.
+
         Args:
             container_name: Name of the container
             blob_name: Name of the blob
@@ -117,32 +363,76 @@ class StorageHelper:
         Returns:
             Blob content as string, or None if error
         """
+        content = self.download_blob_to_bytes(container_name, blob_name)
+        if content is None:
+            return None
+
         try:
-            logger.info(f"Downloading blob to string: {blob_name}")
+            return content.decode('utf-8')
+        except UnicodeDecodeError as e:
+            logger.error("Blob %s is not valid UTF-8 text: %s", blob_name, e)
+            return None
 
-            blob_client = self.blob_service_client.get_blob_client(
-                container=container_name,
-                blob=blob_name
-            )
+    def download_blob_to_bytes(self, container_name: str, blob_name: str) -> Optional[bytes]:
+        """
+        Download a blob into memory as raw bytes.
 
-            download_stream = blob_client.download_blob()
-            content = download_stream.readall().decode('utf-8')
+        With the content cache enabled, a blob read before is requested with If-None-Match
+        on its cached ETag, and the cached bytes are returned when the service answers 304.
 
-            logger.info(f"Successfully downloaded {blob_name} ({len(content)} characters)")
+        Args:
+            container_name: Name of the container
+            blob_name: Name of the blob
+
+        Returns:
+            Blob content as bytes, or None if error
+        """
+        try:
+            logger.debug("Downloading blob to memory: %s from container: %s", blob_name, container_name)
+
+            blob_client = self._blob_client(container_name, blob_name)
+
+            cache = self._content_cache
+            if cache is None:
+                content = blob_client.download_blob(max_concurrency=self.max_concurrency).readall()
+                logger.debug("Successfully downloaded %s (%s bytes)", blob_name, len(content))
+                return content
+
+            key = (container_name, blob_name)
+            cached = cache.get(key)
+            try:
+                if cached is None:
+                    download_stream = blob_client.download_blob(max_concurrency=self.max_concurrency)
+                else:
+                    download_stream = blob_client.download_blob(
+                        max_concurrency=self.max_concurrency,
+                        if_none_match=cached[0],
+                    )
+            except HttpResponseError as e:
+                if cached is None or e.status_code != 304:
+                    cache.discard(key)
+                    raise
+                logger.debug("Blob %s not modified; using cached content (%s bytes)", blob_name, len(cached[1]))
+                return cached[1]
+
+            content = download_stream.readall()
+            cache.put(key, download_stream.properties.etag, content)
+
+            logger.debug("Successfully downloaded %s (%s bytes)", blob_name, len(content))
             return content
 
         except HttpResponseError as e:
             if getattr(e, 'error_code', '') == 'AuthorizationFailure':
                 logger.error(
-                    "Authorization failure downloading blob %s from container %s. Assign appropriate RBAC role ('Storage Blob Data Reader/Contributor') to managed identity on %s.",
+                    "Authorization failure downloading blob %s from container %s. Ensure managed identity has 'Storage Blob Data Reader' or 'Storage Blob Data Contributor' on storage account %s.",
                     blob_name,
                     container_name,
                     self.storage_account_name,
                 )
-            logger.error(f"HTTP error downloading blob {blob_name}: {e.message}")
+            logger.error("HTTP error downloading blob %s: %s", blob_name, e.message)
             return None
         except Exception as e:
-            logger.error(f"Unexpected error downloading blob {blob_name}: {str(e)}", exc_info=True)
+            logger.error("Unexpected error downloading blob %s: %s", blob_name, e, exc_info=True)
             return None
 
     def test_blob_access(self, container_name: str) -> bool:
@@ -154,7 +444,7 @@ class StorageHelper:
             True if access appears authorized, False otherwise.
         """
         try:
-            container_client = self.blob_service_client.get_container_client(container_name)
+            container_client = self._container_client(container_name)
             container_client.get_container_properties()
             logger.info(
                 "Access test succeeded for container '%s' using storage account '%s' (managed identity).",
@@ -170,10 +460,10 @@ class StorageHelper:
                     self.storage_account_name,
                 )
             else:
-                logger.error(f"HTTP error during access test for container {container_name}: {e.message}")
+                logger.error("HTTP error during access test for container %s: %s", container_name, e.message)
             return False
         except Exception as e:
-            logger.error(f"Unexpected error during access test for container {container_name}: {str(e)}", exc_info=True)
+            logger.error("Unexpected error during access test for container %s: %s", container_name, e, exc_info=True)
             return False
 
     def upload_blob_from_file(self, container_name: str, blob_name: str, local_path: str, overwrite: bool = True) -> bool:
@@ -190,18 +480,107 @@ class StorageHelper:
             True if successful, False otherwise
         """
         try:
-            logger.info(f"Uploading file {local_path} to blob: {blob_name}")
+            logger.debug("Uploading file %s to blob: %s", local_path, blob_name)
+
+            blob_client = self._blob_client(container_name, blob_name)
+            file_size = os.path.getsize(local_path)
 
-            blob_client = self.blob_service_client.get_blob_client(
-                container=container_name,
-                blob=blob_name
+            with _open_for_upload(local_path, file_size) as data:
+                blob_client.upload_blob(data, length=file_size, overwrite=overwrite, max_concurrency=self.max_concurrency)
+
+            logger.debug("Successfully uploaded %s (%s bytes) to %s", local_path, file_size, blob_name)
+            return True
+
+        except HttpResponseError as e:
+            if getattr(e, 'error_code', '') == 'AuthorizationFailure':
+                logger.error(
+                    "Authorization failure uploading blob %s. Ensure the managed identity has the 'Storage Blob Data Contributor' role on the storage account %s.",
+                    blob_name,
+                    self.storage_account_name,
+                )
+            logger.error("HTTP error uploading blob %s: %s", blob_name, e.message)
+            return False
+        except Exception as e:
+            logger.error("Unexpected error uploading blob %s: %s", blob_name, e, exc_info=True)
+            return False
+
+    def upload_large_file(
+        self,
+        container_name: str,
+        blob_name: str,
+        local_path: str,
+        block_size: int = MAX_BLOCK_SIZE,
+        concurrency: int = LARGE_UPLOAD_CONCURRENCY,
+    ) -> bool:
+        """
+        Upload a large local file by staging its blocks in parallel, resuming a previous attempt.
+
+        Block IDs encode the file's size and modification time and the block size, so
+        blocks left uncommitted by an interrupted upload of the same file with the same
+        block_size are reused instead of re-sent. The blob is replaced when the block
+        list is committed.
+
+        Args:
+            container_name: Name of the container
+            blob_name: Name of the blob
+            local_path: Local file path to upload
+            block_size: Bytes per staged block
+            concurrency: Blocks staged at once
+
+        Returns:
+            True if successful, False otherwise
+        """
+        try:
+            stat = os.stat(local_path)
+            if stat.st_size == 0:
+                return self.upload_blob_from_file(container_name, blob_name, local_path)
+
+            blob_client = self._blob_client(container_name, blob_name)
+
+            block_count = -(-stat.st_size // block_size)
+            # Fixed-width fields: every block ID of a blob must have the same length
+            block_ids = [
+                base64.b64encode(
+                    f"{stat.st_size:016d}-{stat.st_mtime_ns:020d}-{block_size:010d}-{i:06d}".encode()
+                ).decode()
+                for i in range(block_count)
+            ]
+
+            # Blocks from an interrupted upload of this same file version can be skipped
+            try:
+                _, uncommitted = blob_client.get_block_list("uncommitted")
+                staged = {block.id: block.size for block in uncommitted}
+            except ResourceNotFoundError:
+                staged = {}
+
+            def block_length(index: int) -> int:
+                return min(block_size, stat.st_size - index * block_size)
+
+            pending = [i for i, block_id in enumerate(block_ids) if staged.get(block_id) != block_length(i)]
+            logger.info(
+                "Uploading %s to blob %s as %d block(s), %d already staged",
+                local_path,
+                blob_name,
+                block_count,
+                block_count - len(pending),
             )
 
-            with open(local_path, "rb") as data:
-                blob_client.upload_blob(data, overwrite=overwrite)
+            with open(local_path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped, \
+                    memoryview(mapped) as view:
+                def stage(index: int) -> None:
+                    start = index * block_size
+                    # A memoryview slice hands the mapped pages to the SDK without copying; releasing
+                    # it on exit keeps a failed request from pinning the mmap open
+                    with view[start:start + block_size] as block:
+                        blob_client.stage_block(block_id=block_ids[index], data=block, length=len(block))
 
-            file_size = os.path.getsize(local_path)
-            logger.info(f"Successfully uploaded {local_path} ({file_size} bytes) to {blob_name}")
+                with ThreadPoolExecutor(max_workers=concurrency) as executor:
+                    # list() re-raises the first failed block; staged blocks are kept for a retry
+                    list(executor.map(stage, pending))
+
+            blob_client.commit_block_list([BlobBlock(block_id=block_id) for block_id in block_ids])
+
+            logger.info("Successfully uploaded %s (%s bytes) to %s", local_path, stat.st_size, blob_name)
             return True
 
         except HttpResponseError as e:
@@ -211,51 +590,91 @@ class StorageHelper:
                     blob_name,
                     self.storage_account_name,
                 )
-            logger.error(f"HTTP error uploading blob {blob_name}: {e.message}")
+            logger.error("HTTP error uploading blob %s: %s", blob_name, e.message)
             return False
         except Exception as e:
-            logger.error(f"Unexpected error uploading blob {blob_name}: {str(e)}", exc_info=True)
+            logger.error("Unexpected error uploading blob %s: %s", blob_name, e, exc_info=True)
             return False
 
     def upload_blob_from_string(self, container_name: str, blob_name: str, content: str, overwrite: bool = True) -> bool:
         """
         Upload a string to blob storage.
 
+        The text is encoded once up front so its exact byte length is known; anything up
+        to MAX_SINGLE_PUT_SIZE then goes out as a single Put Blob request.
+
         Args:
             container_name: Name of the container
             blob_name: Name of the blob
             content: String content to upload
             overwrite: Whether to overwrite if blob exists
 
+        Returns:
+            True if successful, False otherwise
+        """
+        return self.upload_blob_from_bytes(container_name, blob_name, content.encode('utf-8'), overwrite)
+
+    def upload_blob_from_bytes(self, container_name: str, blob_name: str, data: bytes, overwrite: bool = True) -> bool:
+        """
+        Upload in-memory bytes to blob storage.
+
+        Args:
+            container_name: Name of the container
+            blob_name: Name of the blob
+            data: Bytes to upload
+            overwrite: Whether to overwrite if blob exists
+
         Returns:
             True if successful, False otherwise
         """
         try:
-            logger.info(f"Uploading string content to blob: {blob_name}")
+            logger.debug("Uploading %s bytes to blob: %s", len(data), blob_name)
 
-            blob_client = self.blob_service_client.get_blob_client(
-                container=container_name,
-                blob=blob_name
-            )
+            blob_client = self._blob_client(container_name, blob_name)
 
-            blob_client.upload_blob(content, overwrite=overwrite)
+            blob_client.upload_blob(data, length=len(data), overwrite=overwrite, max_concurrency=self.max_concurrency)
 
-            logger.info(f"Successfully uploaded content ({len(content)} characters) to {blob_name}")
+            logger.debug("Successfully uploaded %s bytes to %s", len(data), blob_name)
             return True
 
         except HttpResponseError as e:
             if getattr(e, 'error_code', '') == 'AuthorizationFailure':
                 logger.error(
-                    "Authorization failure uploading blob %s. Assign role 'Storage Blob Data Contributor' to the managed identity on storage account %s.",
+                    "Authorization failure uploading blob %s. Ensure the managed identity has the 'Storage Blob Data Contributor' role on the storage account %s.",
                     blob_name,
                     self.storage_account_name,
                 )
-            logger.error(f"HTTP error uploading blob {blob_name}: {e.message}")
+            logger.error("HTTP error uploading blob %s: %s", blob_name, e.message)
             return False
         except Exception as e:
-            logger.error(f"Unexpected error uploading blob {blob_name}: {str(e)}", exc_info=True)
+            logger.error("Unexpected error uploading blob %s: %s", blob_name, e, exc_info=True)
             return False
 
+    def iter_blob_names(
+        self,
+        container_name: str,
+        name_starts_with: Optional[str] = None,
+        page_size: int = LIST_PAGE_SIZE,
+    ) -> Iterator[str]:
+        """
+        Stream blob names from a container, one listing page at a time.
+
+        Args:
+            container_name: Name of the container
+            name_starts_with: Filter blobs by prefix (optional)
+            page_size: Names requested per List Blobs call
+
+        Returns:
+            Iterator of blob names; errors propagate to the caller
+        """
+        container_client = self._container_client(container_name)
+
+        # list_blob_names skips building BlobProperties for every entry
+        yield from container_client.list_blob_names(
+            name_starts_with=name_starts_with,
+            results_per_page=page_size
+        )
+
     def list_blobs(self, container_name: str, name_starts_with: Optional[str] = None) -> list:
         """
         List blobs in a container.
@@ -268,24 +687,24 @@ class StorageHelper:
             List of blob names
         """
         try:
-            logger.info(f"Listing blobs in container: {container_name}")
-
-            container_client = self.blob_service_client.get_container_client(container_name)
-            blob_list = container_client.list_blobs(name_starts_with=name_starts_with)
+            logger.debug("Listing blobs in container: %s", container_name)
 
-            blob_names = [blob.name for blob in blob_list]
-            logger.info(f"Found {len(blob_names)} blob(s) in {container_name}")
+            blob_names = list(self.iter_blob_names(container_name, name_starts_with))
+            logger.info("Found %s blob(s) in %s", len(blob_names), container_name)
 
             return blob_names
 
         except Exception as e:
-            logger.error(f"Error listing blobs in {container_name}: {str(e)}", exc_info=True)
+            logger.error("Error listing blobs in %s: %s", container_name, e, exc_info=True)
             return []
 
     def blob_exists(self, container_name: str, blob_name: str) -> bool:
         """
         Check if a blob exists.
 
+        To download a blob only when it exists, use try_download_blob_to_file()
+        instead, which needs one request rather than two.
+
         Args:
             container_name: Name of the container
             blob_name: Name of the blob
@@ -294,15 +713,12 @@ class StorageHelper:
             True if blob exists, False otherwise
         """
         try:
-            blob_client = self.blob_service_client.get_blob_client(
-                container=container_name,
-                blob=blob_name
-            )
+            blob_client = self._blob_client(container_name, blob_name)
 
             return blob_client.exists()
 
         except Exception as e:
-            logger.error(f"Error checking if blob {blob_name} exists: {str(e)}", exc_info=True)
+            logger.error("Error checking if blob %s exists: %s", blob_name, e, exc_info=True)
             return False
 
     def delete_blob(self, container_name: str, blob_name: str) -> bool:
@@ -317,21 +733,175 @@ class StorageHelper:
             True if successful, False otherwise
         """
         try:
-            logger.info(f"Deleting blob: {blob_name}")
+            logger.debug("Deleting blob: %s", blob_name)
 
-            blob_client = self.blob_service_client.get_blob_client(
-                container=container_name,
-                blob=blob_name
-            )
+            blob_client = self._blob_client(container_name, blob_name)
 
             blob_client.delete_blob()
-            logger.info(f"Successfully deleted blob: {blob_name}")
+            logger.info("Successfully deleted blob: %s", blob_name)
             return True
 
         except Exception as e:
-            logger.error(f"Error deleting blob {blob_name}: {str(e)}", exc_info=True)
+            logger.error("Error deleting blob %s: %s", blob_name, e, exc_info=True)
             return False
 
+    def delete_blobs(self, container_name: str, blob_names: Iterable[str]) -> int:
+        """
+        Delete many blobs, packing up to 256 deletes into each Blob Batch request.
+
+        Args:
+            container_name: Name of the container
+            blob_names: Names of the blobs to delete
+
+        Returns:
+            Number of blobs deleted
+        """
+        container_client = self._container_client(container_name)
+        names = iter(blob_names)
+        deleted = 0
+
+        while True:
+            chunk = list(islice(names, BLOB_BATCH_MAX_SIZE))
+            if not chunk:
+                break
+
+            try:
+                responses = container_client.delete_blobs(*chunk, raise_on_any_failure=False)
+            except Exception as e:
+                logger.error("Error deleting batch of %s blobs from %s: %s", len(chunk), container_name, e, exc_info=True)
+                continue
+
+            for blob_name, response in zip(chunk, responses):
+                if 200 <= response.status_code < 300:
+                    deleted += 1
+                else:
+                    logger.error("Error deleting blob %s: HTTP %s %s", blob_name, response.status_code, response.reason)
+
+        logger.info("Deleted %s blob(s) from %s", deleted, container_name)
+        return deleted
+
+    def _run_bulk(
+        self,
+        action: str,
+        jobs: Iterable[Tuple[str, Callable[..., bool], tuple]],
+        max_workers: int,
+    ) -> List[Tuple[str, bool]]:
+        """
+        Run (blob_name, transfer, args) jobs on a thread pool as they are produced.
+
+        At most max_workers * 4 jobs are in flight, so a huge listing or directory tree
+        is not turned into futures all at once. Progress is logged once per
+        BULK_LOG_INTERVAL blobs rather than per blob.
+
+        Returns:
+            (blob_name, success) tuples in completion order
+        """
+        results = []
+        failed = 0
+        max_in_flight = max_workers * 4
+
+        def collect(futures: Iterable) -> None:
+            nonlocal failed
+            for future in futures:
+                blob_name = pending.pop(future)
+                try:
+                    ok = bool(future.result())
+                except Exception as e:
+                    logger.error("Unexpected error transferring blob %s: %s", blob_name, e, exc_info=True)
+                    ok = False
+                failed += not ok
+                results.append((blob_name, ok))
+                if len(results) % BULK_LOG_INTERVAL == 0:
+                    logger.info("%s: %s blob(s) done, %s failed", action, len(results), failed)
+
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            pending = {}
+            for blob_name, transfer, args in jobs:
+                pending[executor.submit(transfer, *args)] = blob_name
+                if len(pending) >= max_in_flight:
+                    # Results are collected on the calling thread, so no locking is needed
+                    done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                    collect(done)
+
+            collect(as_completed(pending))
+
+        logger.info("%s: finished %s blob(s), %s failed", action, len(results), failed)
+        return results
+
+    def download_prefix(
+        self,
+        container_name: str,
+        prefix: Optional[str],
+        dest_dir: str,
+        max_workers: int = BULK_MAX_WORKERS,
+    ) -> List[Tuple[str, bool]]:
+        """
+        Download every blob under a prefix into a local directory, in parallel.
+
+        Blob names are mapped to paths below dest_dir ("a/b.json" -> dest_dir/a/b.json);
+        downloads start while the listing is still being paged in.
+
+        Args:
+            container_name: Name of the container
+            prefix: Only download blobs whose names start with this (None for all)
+            dest_dir: Local directory to download into
+            max_workers: Blobs downloaded at once (env: STORAGE_BULK_MAX_WORKERS)
+
+        Returns:
+            (blob_name, success) tuples in completion order
+
+        Raises:
+            Exception: If listing the container fails part-way; downloads already
+                started are finished first, so a truncated listing is never
+                reported as a complete result
+        """
+        root = os.path.abspath(dest_dir)
+
+        def jobs():
+            try:
+                for blob_name in self.iter_blob_names(container_name, prefix):
+                    local_path = os.path.normpath(os.path.join(root, blob_name.lstrip("/")))
+                    if not local_path.startswith(root + os.sep):
+                        logger.error("Skipping blob %s: it maps outside %s", blob_name, root)
+                        continue
+                    yield blob_name, self.download_blob_to_file, (container_name, blob_name, local_path)
+            except Exception as e:
+                logger.error("Error listing blobs in %s: %s", container_name, e, exc_info=True)
+                raise
+
+        return self._run_bulk(f"Downloading {container_name}/{prefix or ''}", jobs(), max_workers)
+
+    def upload_directory(
+        self,
+        container_name: str,
+        local_dir: str,
+        prefix: str = "",
+        overwrite: bool = True,
+        max_workers: int = BULK_MAX_WORKERS,
+    ) -> List[Tuple[str, bool]]:
+        """
+        Upload every file below a local directory, in parallel.
+
+        Args:
+            container_name: Name of the container
+            local_dir: Local directory to upload
+            prefix: Prepended to each file's relative path ("/"-separated) to form its blob name
+            overwrite: Whether to overwrite blobs that already exist
+            max_workers: Files uploaded at once (env: STORAGE_BULK_MAX_WORKERS)
+
+        Returns:
+            (blob_name, success) tuples in completion order
+        """
+        def jobs():
+            for dirpath, _, filenames in os.walk(local_dir):
+                for filename in filenames:
+                    local_path = os.path.join(dirpath, filename)
+                    relative = os.path.relpath(local_path, local_dir).replace(os.sep, "/")
+                    blob_name = prefix + relative
+                    yield blob_name, self.upload_blob_from_file, (container_name, blob_name, local_path, overwrite)
+
+        return self._run_bulk(f"Uploading {local_dir}", jobs(), max_workers)
+
     def get_blob_properties(self, container_name: str, blob_name: str) -> Optional[dict]:
         """
         Get blob properties (metadata, size, etc.).
@@ -344,10 +914,7 @@ class StorageHelper:
             Dictionary of properties, or None if error
         """
         try:
-            blob_client = self.blob_service_client.get_blob_client(
-                container=container_name,
-                blob=blob_name
-            )
+            blob_client = self._blob_client(container_name, blob_name)
 
             properties = blob_client.get_blob_properties()
 
@@ -360,5 +927,232 @@ class StorageHelper:
             }
 
         except Exception as e:
-            logger.error(f"Error getting properties for blob {blob_name}: {str(e)}", exc_info=True)
+            logger.error("Error getting properties for blob %s: %s", blob_name, e, exc_info=True)
+            return None
+
+
+class AsyncStorageHelper:
+    """
+    Asyncio counterpart of StorageHelper for moving many blobs concurrently.
+
+    Uses the azure.storage.blob.aio client (requires aiohttp), so hundreds of
+    latency-bound requests can be in flight on one event loop. Use it as an
+    async context manager so the client and credential are closed afterwards.
+    """
+
+    def __init__(
+        self,
+        storage_account_name: str,
+        use_managed_identity: bool = True,
+        managed_identity_client_id: Optional[str] = None,
+        max_concurrency: int = MAX_CONCURRENCY,
+        max_parallel_blobs: int = MAX_PARALLEL_BLOBS,
+    ):
+        """
+        Initialize Async Storage Helper.
+
+        Args:
+            storage_account_name: Name of the Azure Storage account
+            use_managed_identity: If True, use Managed Identity. If False, use DefaultAzureCredential
+            managed_identity_client_id: Optional client ID for a user-assigned managed identity
+            max_concurrency: Parallel connections per blob download/upload (env: STORAGE_MAX_CONCURRENCY)
+            max_parallel_blobs: Blobs in flight at once for bulk operations (env: STORAGE_MAX_PARALLEL_BLOBS)
+        """
+        self.storage_account_name = storage_account_name
+        self.account_url = f"https://{storage_account_name}.blob.core.windows.net"
+        self.max_concurrency = max_concurrency
+        self.max_parallel_blobs = max_parallel_blobs
+        self._created_dirs = set()
+
+        if use_managed_identity:
+            if managed_identity_client_id:
+                self.credential = AsyncManagedIdentityCredential(client_id=managed_identity_client_id)
+            else:
+                self.credential = AsyncManagedIdentityCredential()
+        else:
+            self.credential = AsyncDefaultAzureCredential()
+
+        self.blob_service_client = AsyncBlobServiceClient(
+            account_url=self.account_url,
+            credential=self.credential,
+            connection_timeout=CONNECTION_TIMEOUT_SECONDS,
+            read_timeout=READ_TIMEOUT_SECONDS,
+            retry_policy=_retry_policy(),
+            max_single_get_size=MAX_SINGLE_GET_SIZE,
+            max_chunk_get_size=MAX_CHUNK_GET_SIZE,
+            max_single_put_size=MAX_SINGLE_PUT_SIZE,
+            max_block_size=MAX_BLOCK_SIZE,
+        )
+
+        logger.info("Initialized AsyncStorageHelper for account: %s", storage_account_name)
+
+    async def __aenter__(self) -> "AsyncStorageHelper":
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.close()
+
+    async def close(self) -> None:
+        """Close the underlying client and credential."""
+        await self.blob_service_client.close()
+        await self.credential.close()
+
+    def _log_error(self, action: str, blob_name: str, error: Exception) -> None:
+        """Log a failed blob operation, with RBAC guidance for authorization failures."""
+        if isinstance(error, HttpResponseError):
+            if getattr(error, 'error_code', '') == 'AuthorizationFailure':
+                logger.error(
+                    "Authorization failure %s blob %s. Ensure the managed identity has the 'Storage Blob Data Contributor' role on the storage account %s.",
+                    action,
+                    blob_name,
+                    self.storage_account_name,
+                )
+            logger.error("HTTP error %s blob %s: %s", action, blob_name, error.message)
+        else:
+            logger.error("Unexpected error %s blob %s: %s", action, blob_name, error, exc_info=True)
+
+    async def download_blob_to_file(self, container_name: str, blob_name: str, local_path: str) -> bool:
+        """
+        Download a blob to a local file.
+
+        Args:
+            container_name: Name of the container
+            blob_name: Name of the blob
+            local_path: Local file path to save to
+
+        Returns:
+            True if successful, False otherwise
+        """
+        try:
+            blob_client = self.blob_service_client.get_blob_client(container=container_name, blob=blob_name)
+
+            _ensure_parent_dir(local_path, self._created_dirs)
+
+            with open(local_path, "wb") as file:
+                download_stream = await blob_client.download_blob(max_concurrency=self.max_concurrency)
+                size = await download_stream.readinto(file)
+
+            logger.debug("Successfully downloaded %s (%s bytes) to %s", blob_name, size, local_path)
+            return True
+
+        except Exception as e:
+            self._log_error("downloading", blob_name, e)
+            return False
+
+    async def download_blob_to_bytes(self, container_name: str, blob_name: str) -> Optional[bytes]:
+        """
+        Download a blob into memory as raw bytes.
+
+        Args:
+            container_name: Name of the container
+            blob_name: Name of the blob
+
+        Returns:
+            Blob content as bytes, or None if error
+        """
+        try:
+            blob_client = self.blob_service_client.get_blob_client(container=container_name, blob=blob_name)
+
+            download_stream = await blob_client.download_blob(max_concurrency=self.max_concurrency)
+            content = await download_stream.readall()
+
+            logger.debug("Successfully downloaded %s (%s bytes)", blob_name, len(content))
+            return content
+
+        except Exception as e:
+            self._log_error("downloading", blob_name, e)
             return None
+
+    async def upload_blob_from_file(self, container_name: str, blob_name: str, local_path: str, overwrite: bool = True) -> bool:
+        """
+        Upload a local file to blob storage.
+
+        Args:
+            container_name: Name of the container
+            blob_name: Name of the blob
+            local_path: Local file path to upload
+            overwrite: Whether to overwrite if blob exists
+
+        Returns:
+            True if successful, False otherwise
+        """
+        try:
+            blob_client = self.blob_service_client.get_blob_client(container=container_name, blob=blob_name)
+
+            with open(local_path, "rb") as data:
+                await blob_client.upload_blob(data, overwrite=overwrite, max_concurrency=self.max_concurrency)
+
+            logger.debug("Successfully uploaded %s to %s", local_path, blob_name)
+            return True
+
+        except Exception as e:
+            self._log_error("uploading", blob_name, e)
+            return False
+
+    async def upload_blob_from_bytes(self, container_name: str, blob_name: str, data: bytes, overwrite: bool = True) -> bool:
+        """
+        Upload in-memory bytes to blob storage.
+
+        Args:
+            container_name: Name of the container
+            blob_name: Name of the blob
+            data: Bytes to upload
+            overwrite: Whether to overwrite if blob exists
+
+        Returns:
+            True if successful, False otherwise
+        """
+        try:
+            blob_client = self.blob_service_client.get_blob_client(container=container_name, blob=blob_name)
+
+            await blob_client.upload_blob(data, length=len(data), overwrite=overwrite, max_concurrency=self.max_concurrency)
+
+            logger.debug("Successfully uploaded %s bytes to %s", len(data), blob_name)
+            return True
+
+        except Exception as e:
+            self._log_error("uploading", blob_name, e)
+            return False
+
+    async def _gather_bounded(self, coroutines: Iterable) -> List:
+        """Run coroutines concurrently, at most max_parallel_blobs at a time, preserving order."""
+        semaphore = asyncio.Semaphore(self.max_parallel_blobs)
+
+        async def bounded(coroutine):
+            async with semaphore:
+                return await coroutine
+
+        return await asyncio.gather(*(bounded(c) for c in coroutines))
+
+    async def download_many(self, items: Iterable[Tuple[str, str, str]]) -> List[bool]:
+        """
+        Download many blobs to local files concurrently.
+
+        Args:
+            items: (container_name, blob_name, local_path) tuples
+
+        Returns:
+            Success flag for each item, in input order
+        """
+        results = await self._gather_bounded(
+            self.download_blob_to_file(container, blob, path) for container, blob, path in items
+        )
+        logger.info("Downloaded %s of %s blob(s)", sum(results), len(results))
+        return results
+
+    async def upload_many(self, items: Iterable[Tuple[str, str, str]], overwrite: bool = True) -> List[bool]:
+        """
+        Upload many local files concurrently.
+
+        Args:
+            items: (container_name, blob_name, local_path) tuples
+            overwrite: Whether to overwrite blobs that already exist
+
+        Returns:
+            Success flag for each item, in input order
+        """
+        results = await self._gather_bounded(
+            self.upload_blob_from_file(container, blob, path, overwrite) for container, blob, path in items
+        )
+        logger.info("Uploaded %s of %s file(s)", sum(results), len(results))
+        return results
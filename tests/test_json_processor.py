@@ -0,0 +1,95 @@
+"""Tests for the JSON processor's aggregation and result serialization."""
+
+import copy
+import json
+import os
+import sys
+import unittest
+from unittest import mock
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(REPO_ROOT, "src", "processor"))
+
+import json_processor  # noqa: E402
+from json_processor import JSONProcessor, dump_json  # noqa: E402
+
+
+def load_sample() -> dict:
+    """Load the bundled sample batch (three completed transactions)."""
+    with open(os.path.join(REPO_ROOT, "samples", "sample-input.json"), encoding="utf-8") as f:
+        return json.load(f)
+
+
+class AggregateTests(unittest.TestCase):
+    """Aggregation over the sample batch."""
+
+    def test_malformed_tax_or_shipping_skips_only_that_row(self):
+        batch = copy.deepcopy(load_sample())
+        batch["transactions"][0]["shipping_cost"] = None
+        batch["transactions"][1]["tax"] = "15.00"
+
+        result = JSONProcessor().process(json.dumps(batch))
+
+        self.assertNotIn("error", result)
+        summary = result["analytics"]["summary"]
+        self.assertEqual(summary["completed_transactions"], 3)
+        self.assertEqual(summary["total_revenue"], 550.61)
+        # Tax from rows 0 and 2; shipping only from row 2, since row 1 stops at its bad tax
+        tax = [t["tax"] for t in load_sample()["transactions"]]
+        shipping = [t["shipping_cost"] for t in load_sample()["transactions"]]
+        self.assertEqual(summary["total_tax"], round(tax[0] + tax[2], 2))
+        self.assertEqual(summary["total_shipping"], round(shipping[2], 2))
+
+
+class DumpJsonTests(unittest.TestCase):
+    """Result serialization with and without orjson."""
+
+    def test_non_string_group_keys_are_stringified(self):
+        batch = copy.deepcopy(load_sample())
+        batch["transactions"][0]["payment_method"] = None
+        batch["transactions"][1]["line_items"][0]["category"] = 7
+        result = JSONProcessor().process(json.dumps(batch))
+
+        expected = json.loads(json.dumps(result))
+        self.assertEqual(json.loads(dump_json(result)), expected)
+        with mock.patch.object(json_processor, "orjson", None):
+            self.assertEqual(json.loads(dump_json(result)), expected)
+
+        self.assertIn("null", expected["analytics"]["payment_methods"])
+        self.assertIn("7", expected["analytics"]["revenue_by_category"])
+
+
+class ValidationParityTests(unittest.TestCase):
+    """The _is_valid fast path must agree with validate_transaction."""
+
+    CASES = {
+        "valid": lambda t: None,
+        "missing field": lambda t: t.pop("timestamp"),
+        "missing customer_id": lambda t: t["customer"].pop("customer_id"),
+        "empty email": lambda t: t["customer"].update(email=""),
+        "no line items": lambda t: t.update(line_items=[]),
+        "zero quantity": lambda t: t["line_items"][0].update(quantity=0),
+        "negative quantity": lambda t: t["line_items"][-1].update(quantity=-2),
+        "missing quantity": lambda t: t["line_items"][0].pop("quantity"),
+        "quantity out of range": lambda t: t["line_items"][0].update(quantity=JSONProcessor.MAX_QUANTITY + 1),
+        "quantity at maximum": lambda t: t["line_items"][0].update(quantity=JSONProcessor.MAX_QUANTITY),
+        "unit price out of range": lambda t: t["line_items"][0].update(unit_price=JSONProcessor.MAX_UNIT_PRICE + 1),
+        "negative total": lambda t: t.update(total=-1.0),
+        "zero total": lambda t: t.update(total=0),
+        "total out of range": lambda t: t.update(total=JSONProcessor.MAX_TOTAL + 1),
+        "bad timestamp": lambda t: t.update(timestamp="15/01/2024 10:30"),
+        "zulu timestamp": lambda t: t.update(timestamp="2024-01-15T10:30:00Z"),
+    }
+
+    def test_is_valid_matches_validate_transaction(self):
+        processor = JSONProcessor()
+        for base in load_sample()["transactions"]:
+            for name, mutate in self.CASES.items():
+                transaction = copy.deepcopy(base)
+                mutate(transaction)
+                with self.subTest(case=name, transaction=base["transaction_id"]):
+                    self.assertEqual(processor._is_valid(transaction), processor.validate_transaction(transaction)[0])
+
+
+if __name__ == "__main__":
+    unittest.main()
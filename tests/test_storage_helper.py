@@ -0,0 +1,249 @@
+"""Tests for the blob storage helper's pure-logic pieces, using fake blob clients."""
+
+import os
+import sys
+import tempfile
+import threading
+import time
+import unittest
+from types import SimpleNamespace
+from unittest import mock
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(REPO_ROOT, "src", "processor"))
+
+try:
+    import storage_helper  # noqa: E402
+except ImportError:  # azure-storage-blob / azure-identity are not installed
+    raise unittest.SkipTest("storage_helper needs the Azure SDK from src/requirements.txt")
+
+from storage_helper import StorageHelper  # noqa: E402
+
+
+def make_helper(**kwargs) -> StorageHelper:
+    """Build a StorageHelper without creating a real credential or service client."""
+    with mock.patch.object(storage_helper, "_get_blob_service_client", return_value=(None, object())):
+        return StorageHelper("testaccount", **kwargs)
+
+
+class FakeBlockBlobClient:
+    """Keeps staged blocks in memory and assembles the blob on commit."""
+
+    def __init__(self, fail_after=None):
+        self.staged = {}
+        self.content = None
+        self.stage_calls = 0
+        self.fail_after = fail_after
+
+    def get_block_list(self, block_list_type):
+        return [], [SimpleNamespace(id=block_id, size=len(data)) for block_id, data in self.staged.items()]
+
+    def stage_block(self, block_id, data, length=None):
+        if self.fail_after is not None and self.stage_calls >= self.fail_after:
+            raise ConnectionError("connection dropped")
+        self.stage_calls += 1
+        self.staged[block_id] = bytes(data)
+
+    def commit_block_list(self, blocks):
+        self.content = b"".join(self.staged[block.id] for block in blocks)
+        self.staged = {}
+
+
+class UploadLargeFileTests(unittest.TestCase):
+    """Resumable block uploads."""
+
+    def setUp(self):
+        self.data = os.urandom(10 * 1024 + 123)
+        handle, self.path = tempfile.mkstemp()
+        with os.fdopen(handle, "wb") as f:
+            f.write(self.data)
+        self.addCleanup(os.remove, self.path)
+
+        self.helper = make_helper()
+        self.blob = FakeBlockBlobClient()
+        self.helper._blob_client = lambda container, blob: self.blob
+
+    def upload(self, block_size):
+        return self.helper.upload_large_file("c", "big.bin", self.path, block_size=block_size, concurrency=1)
+
+    def test_resume_reuses_blocks_staged_with_same_block_size(self):
+        self.blob.fail_after = 3
+        self.assertFalse(self.upload(1024))
+
+        self.blob.fail_after = None
+        self.blob.stage_calls = 0
+        self.assertTrue(self.upload(1024))
+
+        self.assertEqual(self.blob.stage_calls, 11 - 3)
+        self.assertEqual(self.blob.content, self.data)
+
+    def test_resume_with_changed_block_size_restages_everything(self):
+        self.blob.fail_after = 3
+        self.assertFalse(self.upload(1024))
+
+        self.blob.fail_after = None
+        self.blob.stage_calls = 0
+        self.assertTrue(self.upload(1536))
+
+        self.assertEqual(self.blob.stage_calls, 7)
+        self.assertEqual(self.blob.content, self.data)
+
+
+class BlobContentCacheTests(unittest.TestCase):
+    """Byte-capped LRU behind the ETag-revalidated reads."""
+
+    def test_size_accounting_and_lru_eviction_order(self):
+        cache = storage_helper._BlobContentCache(max_bytes=10)
+        cache.put(("c", "a"), "e1", b"aaaa")
+        cache.put(("c", "b"), "e2", b"bbbb")
+        self.assertEqual(cache._size, 8)
+
+        cache.get(("c", "a"))  # "b" is now least recently used
+        cache.put(("c", "x"), "e3", b"xxx")
+
+        self.assertIsNone(cache.get(("c", "b")))
+        self.assertEqual(cache.get(("c", "a")), ("e1", b"aaaa"))
+        self.assertEqual(cache._size, 7)
+
+    def test_replacing_and_discarding_entries_adjusts_size(self):
+        cache = storage_helper._BlobContentCache(max_bytes=10)
+        cache.put(("c", "a"), "e1", b"aaaa")
+        cache.put(("c", "a"), "e2", b"aaaaaa")
+        self.assertEqual(cache._size, 6)
+        self.assertEqual(cache.get(("c", "a")), ("e2", b"aaaaaa"))
+
+        cache.discard(("c", "a"))
+        self.assertEqual(cache._size, 0)
+        self.assertIsNone(cache.get(("c", "a")))
+
+    def test_content_larger_than_budget_is_not_cached(self):
+        cache = storage_helper._BlobContentCache(max_bytes=4)
+        cache.put(("c", "small"), "e1", b"ss")
+        cache.put(("c", "big"), "e2", b"bbbbb")
+
+        self.assertIsNone(cache.get(("c", "big")))
+        self.assertEqual(cache.get(("c", "small")), ("e1", b"ss"))
+        self.assertEqual(cache._size, 2)
+
+
+class FakeVersionedBlobClient:
+    """Serves one blob version and answers If-None-Match on its current ETag with 304."""
+
+    def __init__(self, content, etag):
+        self.content = content
+        self.etag = etag
+        self.requests = []
+
+    def download_blob(self, max_concurrency=1, if_none_match=None):
+        self.requests.append(if_none_match)
+        if if_none_match is not None and if_none_match == self.etag:
+            error = storage_helper.HttpResponseError(message="Not Modified")
+            error.status_code = 304
+            raise error
+        return SimpleNamespace(readall=lambda: self.content, properties=SimpleNamespace(etag=self.etag))
+
+
+class CachedDownloadTests(unittest.TestCase):
+    """download_blob_to_bytes with the content cache enabled."""
+
+    def setUp(self):
+        self.helper = make_helper(cache_max_bytes=1024)
+        self.blob = FakeVersionedBlobClient(b'{"v": 1}', '"etag-1"')
+        self.helper._blob_client = lambda container, blob: self.blob
+
+    def test_unchanged_blob_is_served_from_cache_after_304(self):
+        self.assertEqual(self.helper.download_blob_to_bytes("c", "cfg.json"), b'{"v": 1}')
+        self.assertEqual(self.helper.download_blob_to_bytes("c", "cfg.json"), b'{"v": 1}')
+        self.assertEqual(self.blob.requests, [None, '"etag-1"'])
+
+    def test_changed_blob_replaces_cached_content(self):
+        self.helper.download_blob_to_bytes("c", "cfg.json")
+        self.blob.content, self.blob.etag = b'{"v": 2}', '"etag-2"'
+
+        self.assertEqual(self.helper.download_blob_to_bytes("c", "cfg.json"), b'{"v": 2}')
+        self.assertEqual(self.helper.download_blob_to_bytes("c", "cfg.json"), b'{"v": 2}')
+        self.assertEqual(self.blob.requests, [None, '"etag-1"', '"etag-2"'])
+
+    def test_cache_disabled_by_default(self):
+        helper = make_helper()
+        helper._blob_client = lambda container, blob: self.blob
+        helper.download_blob_to_bytes("c", "cfg.json")
+        helper.download_blob_to_bytes("c", "cfg.json")
+        self.assertEqual(self.blob.requests, [None, None])
+
+
+class EnsureParentDirTests(unittest.TestCase):
+    """Directory creation is done once per directory."""
+
+    def test_makedirs_called_once_per_directory(self):
+        root = tempfile.mkdtemp()
+        created = set()
+        with mock.patch.object(storage_helper.os, "makedirs", wraps=os.makedirs) as makedirs:
+            for name in ("a.json", "b.json", "sub/c.json", "sub/d.json"):
+                storage_helper._ensure_parent_dir(os.path.join(root, "out", name), created)
+
+        self.assertEqual(makedirs.call_count, 2)
+        self.assertTrue(os.path.isdir(os.path.join(root, "out", "sub")))
+
+
+class BulkTransferTests(unittest.TestCase):
+    """download_prefix / _run_bulk with fake listing and transfers."""
+
+    def setUp(self):
+        self.helper = make_helper()
+        self.dest = tempfile.mkdtemp()
+        self.lock = threading.Lock()
+        self.running = 0
+        self.max_running = 0
+        self.started = 0
+        self.finished = 0
+        self.downloaded = []
+
+    def fake_download(self, container, blob_name, local_path):
+        with self.lock:
+            self.running += 1
+            self.max_running = max(self.max_running, self.running)
+        time.sleep(0.001)
+        with self.lock:
+            self.running -= 1
+            self.finished += 1
+            self.downloaded.append(local_path)
+        return True
+
+    def test_concurrency_and_in_flight_caps_are_never_exceeded(self):
+        max_workers = 3
+        ahead = []
+
+        def names(container, prefix):
+            for i in range(200):
+                with self.lock:
+                    ahead.append(self.started - self.finished)
+                    self.started += 1
+                yield f"out/{i}.json"
+
+        self.helper.iter_blob_names = names
+        self.helper.download_blob_to_file = self.fake_download
+
+        results = self.helper.download_prefix("c", "out/", self.dest, max_workers=max_workers)
+
+        self.assertEqual(len(results), 200)
+        self.assertTrue(all(ok for _, ok in results))
+        self.assertLessEqual(self.max_running, max_workers)
+        self.assertLessEqual(max(ahead), max_workers * 4)
+
+    def test_blob_names_escaping_dest_dir_are_rejected(self):
+        self.helper.iter_blob_names = lambda container, prefix: iter(["../x", "a/../../y", "/ok.json", "a/b.json"])
+        self.helper.download_blob_to_file = self.fake_download
+
+        results = self.helper.download_prefix("c", None, self.dest, max_workers=2)
+
+        self.assertEqual(sorted(name for name, _ in results), ["/ok.json", "a/b.json"])
+        root = os.path.abspath(self.dest)
+        self.assertEqual(
+            sorted(self.downloaded),
+            [os.path.join(root, "a", "b.json"), os.path.join(root, "ok.json")],
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()